@@ -4,20 +4,22 @@ Streamlit Web App for Ray Dalio Economic Cycle Backtester
 Run with: streamlit run app.py
 """
 
+import math
+import os
+import re
+
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 from datetime import datetime
 
-from data_fetcher import EconomicDataFetcher
-from cycle_classifier import EconomicCycleClassifier
-from backtester import Backtester
-from backtester_enhanced import BacktesterEnhanced
-from intraday_fetcher import IntradayDataFetcher
-from swing_backtester import SwingBacktester
+# plotly and the project modules (fetchers, classifier, backtesters) are
+# imported where they are used so the first page render does not wait on
+# them or on fredapi/yfinance/polygon; config only holds sidebar defaults
+# and chart_utils/disk_cache only need pandas/NumPy
 import config
+from chart_utils import downsample, drawdown, lttb
+from disk_cache import CACHE_DIR, read_frame, write_frame
 
 
 # Page config
@@ -28,366 +30,94 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Apple-inspired custom CSS
-st.markdown("""
-<style>
-    /* Import fonts closer to SF Pro */
-    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&family=Roboto:wght@300;400;500;700&family=System-ui&display=swap');
-
-    /* Global styles - SF Pro fallback stack */
-    * {
-        font-family: -apple-system, BlinkMacSystemFont, 'SF Pro Display', 'SF Pro Text', 'Helvetica Neue', 'Segoe UI', 'Roboto', 'Inter', sans-serif;
-        color: #1d1d1f !important;
-    }
-
-    /* Override Streamlit's default white text */
-    body, p, div, span, label, a, li, td, th {
-        color: #1d1d1f !important;
-    }
-
-    /* Main background */
-    .main {
-        background-color: #f5f5f7 !important;
-    }
-
-    .stApp {
-        background-color: #f5f5f7 !important;
-    }
-
-    [data-testid="stAppViewContainer"] {
-        background-color: #f5f5f7 !important;
-    }
-
-    /* Headers - Apple style */
-    h1 {
-        font-size: 3rem !important;
-        font-weight: 700 !important;
-        color: #1d1d1f !important;
-        letter-spacing: -0.02em !important;
-        line-height: 1.1 !important;
-        margin-bottom: 0.5rem !important;
-    }
-
-    h2 {
-        font-size: 2rem !important;
-        font-weight: 600 !important;
-        color: #1d1d1f !important;
-        letter-spacing: -0.01em !important;
-        margin-top: 2rem !important;
-        margin-bottom: 1rem !important;
-    }
-
-    h3 {
-        font-size: 1.5rem !important;
-        font-weight: 600 !important;
-        color: #1d1d1f !important;
-        margin-top: 1.5rem !important;
-    }
-
-    /* Subtitle text */
-    .main p {
-        font-size: 1rem !important;
-        color: #6e6e73 !important;
-        line-height: 1.6 !important;
-    }
-
-    /* All text elements */
-    .main div, .main span, .main label {
-        color: #1d1d1f !important;
-    }
-
-    /* Markdown text */
-    .main .stMarkdown {
-        color: #1d1d1f !important;
-    }
-
-    /* Metrics - Card style */
-    [data-testid="stMetricValue"] {
-        font-size: 2.5rem !important;
-        font-weight: 600 !important;
-        color: #1d1d1f !important;
-    }
-
-    [data-testid="stMetricLabel"] {
-        font-size: 0.875rem !important;
-        font-weight: 500 !important;
-        color: #6e6e73 !important;
-        text-transform: uppercase;
-        letter-spacing: 0.05em;
-    }
-
-    [data-testid="stMetricDelta"] {
-        font-size: 0.875rem !important;
-    }
-
-    /* Cards/Containers - removed to avoid over-styling */
-    /* Individual components will have their own styling */
-
-    /* Info boxes */
-    .stAlert {
-        background-color: white !important;
-        border: none !important;
-        border-radius: 18px !important;
-        padding: 1.5rem !important;
-        box-shadow: 0 2px 8px rgba(0, 0, 0, 0.05) !important;
-    }
-
-    /* Buttons */
-    .stButton > button {
-        background: linear-gradient(180deg, #0071e3 0%, #005bb5 100%) !important;
-        color: white !important;
-        border: none !important;
-        border-radius: 12px !important;
-        padding: 0.75rem 1.5rem !important;
-        font-size: 1rem !important;
-        font-weight: 500 !important;
-        letter-spacing: -0.01em !important;
-        transition: all 0.2s ease !important;
-        box-shadow: 0 2px 8px rgba(0, 113, 227, 0.2) !important;
-    }
-
-    .stButton > button * {
-        color: white !important;
-    }
-
-    .stButton > button p {
-        color: white !important;
-    }
-
-    .stButton > button:hover {
-        transform: translateY(-1px);
-        box-shadow: 0 4px 12px rgba(0, 113, 227, 0.3) !important;
-    }
-
-    /* Number input - fix black background issue */
-    .stNumberInput > div > div {
-        background-color: white !important;
-    }
-
-    .stNumberInput input[type="number"] {
-        background-color: white !important;
-        color: #1d1d1f !important;
-    }
-
-    /* Number input buttons (- and +) */
-    .stNumberInput button {
-        background-color: #e5e5e7 !important;
-        color: #1d1d1f !important;
-        border: none !important;
-        border-radius: 6px !important;
-    }
-
-    .stNumberInput button:hover {
-        background-color: #d1d1d6 !important;
-    }
-
-    .stNumberInput button * {
-        color: #1d1d1f !important;
-    }
-
-    /* Sidebar */
-    [data-testid="stSidebar"] {
-        background-color: #fbfbfd !important;
-        border-right: 1px solid #d2d2d7;
-    }
-
-    [data-testid="stSidebar"] h1,
-    [data-testid="stSidebar"] h2,
-    [data-testid="stSidebar"] h3,
-    [data-testid="stSidebar"] p,
-    [data-testid="stSidebar"] label,
-    [data-testid="stSidebar"] div,
-    [data-testid="stSidebar"] span {
-        color: #1d1d1f !important;
-    }
-
-    [data-testid="stSidebar"] .stMarkdown {
-        color: #1d1d1f !important;
-    }
-
-    /* Radio buttons */
-    .stRadio > label {
-        font-weight: 500 !important;
-        color: #1d1d1f !important;
-    }
-
-    .stRadio label {
-        color: #1d1d1f !important;
-    }
+# Apple-inspired custom CSS (kept readable in assets/, minified when loaded)
+CSS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'assets', 'style.css')
 
-    .stRadio div[role="radiogroup"] label {
-        color: #1d1d1f !important;
-    }
 
-    /* Sliders */
-    .stSlider > div > div > div {
-        background-color: #0071e3 !important;
-    }
+@st.cache_data(show_spinner=False)
+def load_css(path=CSS_PATH):
+    """Read the app stylesheet once and strip comments and whitespace"""
+    with open(path) as f:
+        css = f.read()
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.S)
+    css = re.sub(r'\s+', ' ', css)
+    css = re.sub(r'\s*([{};,>])\s*', r'\1', css)
+    return css.strip()
 
-    /* Text inputs */
-    .stTextInput > div > div > input,
-    .stNumberInput > div > div > input {
-        border-radius: 8px !important;
-        border: 1px solid #d2d2d7 !important;
-        padding: 0.5rem 0.75rem !important;
-        background-color: white !important;
-        color: #1d1d1f !important;
-    }
 
-    .stNumberInput input {
-        color: #1d1d1f !important;
-    }
+st.markdown(f"<style>{load_css()}</style>", unsafe_allow_html=True)
 
-    /* Selectbox styling */
-    .stSelectbox > div > div {
-        background-color: white !important;
-    }
 
-    .stSelectbox input {
-        background-color: white !important;
-        color: #1d1d1f !important;
-    }
+# Results columns plotted by the daily backtest charts
+CHART_COLUMNS = ['strategy_value', 'buyhold_value', 'position']
 
-    .stSelectbox [data-baseweb="select"] {
-        background-color: white !important;
-    }
+# Results columns plotted by the swing trading chart
+SWING_CHART_COLUMNS = ['close', 'bb_upper', 'bb_middle', 'bb_lower', 'signal', 'rsi', 'equity', 'position']
 
-    .stSelectbox [data-baseweb="select"] > div {
-        background-color: white !important;
-        color: #1d1d1f !important;
-    }
-
-    /* Selectbox dropdown menu */
-    [data-baseweb="popover"] {
-        background-color: white !important;
-    }
-
-    [role="listbox"] {
-        background-color: white !important;
-    }
-
-    [role="option"] {
-        background-color: white !important;
-        color: #1d1d1f !important;
-    }
-
-    [role="option"]:hover {
-        background-color: #f5f5f7 !important;
-    }
-
-    /* Checkboxes */
-    .stCheckbox {
-        font-weight: 400 !important;
-    }
-
-    .stCheckbox label {
-        color: #1d1d1f !important;
-    }
-
-    /* Input labels */
-    label {
-        color: #1d1d1f !important;
-    }
-
-    /* Dataframe */
-    [data-testid="stDataFrame"] {
-        border-radius: 12px !important;
-        overflow: hidden !important;
-        box-shadow: 0 2px 8px rgba(0, 0, 0, 0.05) !important;
-        background-color: white !important;
-    }
-
-    [data-testid="stDataFrame"] table {
-        background-color: white !important;
-    }
-
-    [data-testid="stDataFrame"] th {
-        background-color: #f5f5f7 !important;
-        color: #1d1d1f !important;
-    }
-
-    [data-testid="stDataFrame"] td {
-        background-color: white !important;
-        color: #1d1d1f !important;
-    }
+# Range selector buttons shared by the daily backtest charts
+RANGESELECTOR = dict(
+    buttons=[
+        dict(count=1, label="1M", step="month", stepmode="backward"),
+        dict(count=3, label="3M", step="month", stepmode="backward"),
+        dict(count=6, label="6M", step="month", stepmode="backward"),
+        dict(count=1, label="1Y", step="year", stepmode="backward"),
+        dict(count=2, label="2Y", step="year", stepmode="backward"),
+        dict(count=5, label="5Y", step="year", stepmode="backward"),
+        dict(step="all", label="All")
+    ],
+    bgcolor="lightgray",
+    activecolor="darkgray"
+)
 
-    /* Success message */
-    .stSuccess {
-        background-color: #d1f4e0 !important;
-        color: #0a6b32 !important;
-        border-radius: 12px !important;
-    }
+# Dark tick/title text applied to every chart axis
+AXIS_STYLE = dict(tickfont=dict(color='#1d1d1f'), title_font=dict(color='#1d1d1f'))
 
-    /* Dividers */
-    hr {
-        border: none !important;
-        border-top: 1px solid #d2d2d7 !important;
-        margin: 2rem 0 !important;
-    }
+# Layout settings shared by every chart
+BASE_LAYOUT = dict(
+    showlegend=True,
+    hovermode='x unified',
+    plot_bgcolor='white',
+    paper_bgcolor='white',
+    font=dict(color='#1d1d1f', size=12)
+)
 
-    /* Download button */
-    .stDownloadButton > button {
-        background-color: white !important;
-        color: #0071e3 !important;
-        border: 1px solid #0071e3 !important;
-        border-radius: 12px !important;
-    }
+# Subplot titles (the swing price title is formatted with the symbol)
+PERFORMANCE_SUBPLOT_TITLES = ('Portfolio Value', 'Drawdown', 'Position')
+COMPARISON_SUBPLOT_TITLES = ('Portfolio Value Comparison', 'Position Comparison')
+SWING_SUBPLOT_TITLES = ('{symbol} Price with Bollinger Bands', 'RSI Indicator', 'Equity Curve', 'Position')
 
-    .stDownloadButton > button:hover {
-        background-color: #f5f5f7 !important;
-    }
 
-    /* Hide streamlit branding */
-    #MainMenu {visibility: hidden;}
-    footer {visibility: hidden;}
+@st.cache_resource(show_spinner=False)
+def get_economic_fetcher():
+    """Shared FRED/Yahoo fetcher - created once per server process"""
+    from data_fetcher import EconomicDataFetcher
 
-    /* Spacing */
-    .block-container {
-        padding-top: 2rem !important;
-        padding-bottom: 2rem !important;
-        max-width: 1400px !important;
-    }
+    return EconomicDataFetcher()
 
-    /* Column containers */
-    [data-testid="column"] {
-        background-color: white;
-        border-radius: 18px;
-        padding: 1.5rem;
-        box-shadow: 0 2px 8px rgba(0, 0, 0, 0.05);
-    }
 
-    /* Expander */
-    .streamlit-expanderHeader {
-        background-color: white !important;
-        border-radius: 12px !important;
-        font-weight: 500 !important;
-    }
+@st.cache_resource(show_spinner=False)
+def get_intraday_fetcher():
+    """Shared Polygon fetcher - keeps one REST client (and its connection pool) per server process"""
+    from intraday_fetcher import IntradayDataFetcher
 
-    /* Tab styling */
-    .stTabs [data-baseweb="tab-list"] {
-        gap: 8px;
-    }
+    return IntradayDataFetcher()
 
-    .stTabs [data-baseweb="tab"] {
-        border-radius: 8px;
-        padding: 0.5rem 1rem;
-        font-weight: 500;
-    }
 
-    /* Remove dark mode elements */
-    [data-testid="stHeader"] {
-        background-color: transparent !important;
-    }
-</style>
-""", unsafe_allow_html=True)
+# Intraday bars are also kept on disk (one parquet file per symbol/window per
+# day) so restarts and new server processes skip the Polygon round trip. FRED
+# and Yahoo data are cached on disk by EconomicDataFetcher itself.
+INTRADAY_CACHE_DIR = os.path.join(CACHE_DIR, 'intraday')
+INTRADAY_CACHE_MAX_AGE = 24 * 60 * 60  # seconds
 
 
 # Cache data fetching to avoid re-downloading every time
-# Cache key includes start_date so changing date fetches new data
-@st.cache_data(ttl=3600, show_spinner=False)  # Cache for 1 hour
+# Cache key includes start_date so changing date fetches new data.
+# cache_resource returns the stored frames without re-hashing/copying them,
+# so callers must treat them as read-only.
+@st.cache_resource(ttl=3600, show_spinner=False)  # Cache for 1 hour
 def fetch_data(start_date):
     """Fetch economic and market data"""
-    fetcher = EconomicDataFetcher()
+    fetcher = get_economic_fetcher()
     economic_data = fetcher.fetch_all_indicators(start_date=start_date)
     spy_data = fetcher.get_market_data('SPY', start_date=start_date)
     return economic_data, spy_data
@@ -396,147 +126,237 @@ def fetch_data(start_date):
 @st.cache_data(ttl=3600, show_spinner=False)
 def classify_cycles(economic_data, start_date):
     """Classify economic cycles - start_date added to cache key"""
+    from cycle_classifier import EconomicCycleClassifier
+
     classifier = EconomicCycleClassifier()
     cycle_stages = classifier.classify(economic_data)
     return cycle_stages, classifier
 
 
-def get_cycle_explanation(stage, economic_data):
-    """Generate explanation for why we're in a particular cycle stage"""
-
-    # Get latest values - look back up to 30 days to find most recent valid data
-    def get_latest_valid(series_name):
-        """Get most recent non-NaN value from a series"""
-        if series_name not in economic_data.columns:
-            return None
-        # Look at last 30 rows to find most recent valid value
-        recent_values = economic_data[series_name].iloc[-30:]
-        valid_values = recent_values.dropna()
-        if len(valid_values) > 0:
-            return valid_values.iloc[-1]
-        return None
-
-    gdp_growth = get_latest_valid('GDP_GROWTH')
-    unemployment = get_latest_valid('UNEMPLOYMENT')
-    inflation = get_latest_valid('INFLATION_RATE')
-    yield_curve = get_latest_valid('YIELD_CURVE')
-
-    # Calculate trends (last 90 days)
-    if len(economic_data) > 90:
-        recent = economic_data.iloc[-90:]
-        unemployment_trend = recent['UNEMPLOYMENT'].iloc[-1] - recent['UNEMPLOYMENT'].iloc[0] if 'UNEMPLOYMENT' in recent else None
-    else:
-        unemployment_trend = None
-
-    if stage == "Expansion":
-        explanation = "🟢 **The economy is in Expansion phase.** "
-        reasons = []
-
-        if gdp_growth is not None and not pd.isna(gdp_growth) and gdp_growth > 0:
-            reasons.append(f"GDP growth is positive at {gdp_growth:.1f}%")
-
-        if unemployment is not None and not pd.isna(unemployment):
-            if unemployment < 5:
-                reasons.append(f"unemployment is low at {unemployment:.1f}%")
-            elif unemployment_trend is not None and not pd.isna(unemployment_trend) and unemployment_trend < 0:
-                reasons.append(f"unemployment is falling (currently {unemployment:.1f}%)")
-            else:
-                reasons.append(f"unemployment is moderate at {unemployment:.1f}%")
-
-        if inflation is not None and not pd.isna(inflation):
-            if inflation < 3:
-                reasons.append(f"inflation is moderate at {inflation:.1f}%")
-            elif inflation < 5:
-                reasons.append(f"inflation is manageable at {inflation:.1f}%")
-
-        if yield_curve is not None and not pd.isna(yield_curve) and yield_curve > 0:
-            reasons.append(f"the yield curve is positive ({yield_curve:.2f}% spread)")
-
-        if reasons:
-            explanation += "Key indicators: " + ", ".join(reasons) + ". "
-        else:
-            explanation += "Economic indicators show positive conditions. "
-
-        explanation += "This is typically a good environment for stocks, with economic activity growing steadily."
-
-    elif stage == "Peak":
-        explanation = "🟡 **The economy is at Peak phase.** "
-        reasons = []
-
-        if gdp_growth is not None and not pd.isna(gdp_growth):
-            if gdp_growth > 0:
-                reasons.append(f"GDP growth is slowing but still positive ({gdp_growth:.1f}%)")
-            else:
-                reasons.append(f"GDP growth has turned negative ({gdp_growth:.1f}%)")
+@st.cache_resource(ttl=900, show_spinner=False)
+def fetch_intraday_data(symbol, days_back):
+    """Fetch 30-minute bars - read-only, SwingBacktester never modifies its input"""
+    path = os.path.join(INTRADAY_CACHE_DIR, f"intraday_{symbol}_{days_back}_{datetime.now():%Y%m%d}.parquet")
+    intraday_data = read_frame(path)
+    if intraday_data is not None:
+        return intraday_data
 
-        if inflation is not None and not pd.isna(inflation) and inflation > 3.5:
-            reasons.append(f"inflation is elevated at {inflation:.1f}%")
+    intraday_data = get_intraday_fetcher().fetch_30min_bars(symbol, days_back=days_back)
+    write_frame(intraday_data, path, max_age=INTRADAY_CACHE_MAX_AGE)
+    return intraday_data
 
-        if yield_curve is not None and not pd.isna(yield_curve) and yield_curve < 0:
-            reasons.append(f"the yield curve is inverted ({yield_curve:.2f}% - recession warning)")
 
-        if unemployment is not None and not pd.isna(unemployment) and unemployment < 4:
-            reasons.append(f"unemployment is very low at {unemployment:.1f}% (tight labor market)")
-
-        if reasons:
-            explanation += "Warning signs: " + ", ".join(reasons) + ". "
-        else:
-            explanation += "Economic indicators show late-cycle conditions. "
-
-        explanation += "This phase often precedes an economic contraction. The strategy uses tighter stop-losses to protect gains."
+@st.cache_data(ttl=3600, show_spinner=False)
+def get_expansion_series(start_date):
+    """Daily True/False Expansion filter for the swing backtester - cached on start_date"""
+    economic_data, _ = fetch_data(start_date)
+    cycle_stages, _ = classify_cycles(economic_data, start_date)
+
+    # The comparison already yields a fresh Series, so no copy is needed
+    economic_expansion = cycle_stages == 'Expansion'
+
+    # Ensure index is DatetimeIndex
+    if not isinstance(economic_expansion.index, pd.DatetimeIndex):
+        economic_expansion = pd.Series(
+            economic_expansion.to_numpy(),
+            index=pd.to_datetime(cycle_stages.index),
+            name='expansion'
+        )
 
-    elif stage == "Contraction":
-        explanation = "🔴 **The economy is in Contraction phase.** "
-        reasons = []
+    # The as-of join needs a sorted index - FRED data normally already is
+    if not economic_expansion.index.is_monotonic_increasing:
+        economic_expansion = economic_expansion.sort_index()
 
-        if gdp_growth is not None and not pd.isna(gdp_growth) and gdp_growth < 0:
-            reasons.append(f"GDP growth is negative at {gdp_growth:.1f}%")
+    return economic_expansion
 
-        if unemployment is not None and not pd.isna(unemployment):
-            if unemployment_trend is not None and not pd.isna(unemployment_trend) and unemployment_trend > 0.3:
-                reasons.append(f"unemployment is rising rapidly (now {unemployment:.1f}%)")
-            elif unemployment > 6:
-                reasons.append(f"unemployment is elevated at {unemployment:.1f}%")
 
-        if yield_curve is not None and not pd.isna(yield_curve) and yield_curve < -0.2:
-            reasons.append("the yield curve remains deeply inverted")
+# Backtest results are cached as shared resources (no per-hit copy), so
+# callers must treat the returned frames as read-only
+@st.cache_resource(ttl=3600, max_entries=16, show_spinner=False)
+def run_original_backtest(start_date, initial_capital):
+    """Run original strategy - returns (results, metrics, trades)"""
+    from backtester import Backtester
 
-        if reasons:
-            explanation += "Recession indicators: " + ", ".join(reasons) + ". "
-        else:
-            explanation += "Economic indicators show contractionary conditions. "
+    economic_data, spy_data = fetch_data(start_date)
+    cycle_stages, _ = classify_cycles(economic_data, start_date)
 
-        explanation += "This is a risk-off environment. The strategy moves to cash to preserve capital during downturns."
+    backtester = Backtester(spy_data, cycle_stages, initial_capital)
+    results = backtester.run_strategy(long_stages=['Expansion'])
+    return results, backtester.metrics, backtester.trades
 
-    elif stage == "Recovery":
-        explanation = "🔵 **The economy is in Recovery phase.** "
-        reasons = []
 
-        if gdp_growth is not None and not pd.isna(gdp_growth):
-            if 0 <= gdp_growth < 2:
-                reasons.append(f"GDP growth is turning positive ({gdp_growth:.1f}%)")
-            elif gdp_growth >= 2:
-                reasons.append(f"GDP growth is accelerating ({gdp_growth:.1f}%)")
+@st.cache_resource(ttl=3600, max_entries=16, show_spinner=False)
+def run_enhanced_backtest(start_date, initial_capital,
+                          stay_in_peak, peak_stop, expansion_stop, include_recovery):
+    """Run enhanced strategy - returns (results, metrics, trades)"""
+    from backtester_enhanced import BacktesterEnhanced
 
-        if unemployment is not None and not pd.isna(unemployment):
-            if unemployment > 6:
-                if unemployment_trend is not None and not pd.isna(unemployment_trend) and unemployment_trend < -0.1:
-                    reasons.append(f"unemployment is high ({unemployment:.1f}%) but starting to fall")
-                else:
-                    reasons.append(f"unemployment remains elevated at {unemployment:.1f}%")
+    economic_data, spy_data = fetch_data(start_date)
+    cycle_stages, _ = classify_cycles(economic_data, start_date)
 
-        if yield_curve is not None and not pd.isna(yield_curve) and yield_curve > 0:
-            reasons.append("the yield curve has normalized")
+    backtester = BacktesterEnhanced(spy_data, cycle_stages, initial_capital)
+    results = backtester.run_enhanced_strategy(
+        stay_in_peak=stay_in_peak,
+        peak_stop_loss=peak_stop,
+        expansion_stop_loss=expansion_stop,
+        include_recovery=include_recovery
+    )
+    return results, backtester.metrics, backtester.trades
+
+
+# Explanation text per stage: (headline, reasons lead-in, fallback, closing)
+STAGE_TEXT = {
+    "Expansion": (
+        "🟢 **The economy is in Expansion phase.** ",
+        "Key indicators: ",
+        "Economic indicators show positive conditions. ",
+        "This is typically a good environment for stocks, with economic activity growing steadily."
+    ),
+    "Peak": (
+        "🟡 **The economy is at Peak phase.** ",
+        "Warning signs: ",
+        "Economic indicators show late-cycle conditions. ",
+        "This phase often precedes an economic contraction. The strategy uses tighter stop-losses to protect gains."
+    ),
+    "Contraction": (
+        "🔴 **The economy is in Contraction phase.** ",
+        "Recession indicators: ",
+        "Economic indicators show contractionary conditions. ",
+        "This is a risk-off environment. The strategy moves to cash to preserve capital during downturns."
+    ),
+    "Recovery": (
+        "🔵 **The economy is in Recovery phase.** ",
+        "Early recovery signs: ",
+        "Economic indicators show early recovery. ",
+        "This is often the best time to invest, as the economy rebounds from recession lows."
+    ),
+}
+
+# Reason rules per stage: (predicate, template), evaluated in order.
+# Predicates receive the latest indicator values with NaN already mapped to None.
+STAGE_RULES = {
+    "Expansion": [
+        (lambda v: v['gdp'] is not None and v['gdp'] > 0,
+         "GDP growth is positive at {gdp:.1f}%"),
+        (lambda v: v['unemployment'] is not None and v['unemployment'] < 5,
+         "unemployment is low at {unemployment:.1f}%"),
+        (lambda v: v['unemployment'] is not None and v['unemployment'] >= 5
+            and v['unemployment_trend'] is not None and v['unemployment_trend'] < 0,
+         "unemployment is falling (currently {unemployment:.1f}%)"),
+        (lambda v: v['unemployment'] is not None and v['unemployment'] >= 5
+            and not (v['unemployment_trend'] is not None and v['unemployment_trend'] < 0),
+         "unemployment is moderate at {unemployment:.1f}%"),
+        (lambda v: v['inflation'] is not None and v['inflation'] < 3,
+         "inflation is moderate at {inflation:.1f}%"),
+        (lambda v: v['inflation'] is not None and 3 <= v['inflation'] < 5,
+         "inflation is manageable at {inflation:.1f}%"),
+        (lambda v: v['yield_curve'] is not None and v['yield_curve'] > 0,
+         "the yield curve is positive ({yield_curve:.2f}% spread)"),
+    ],
+    "Peak": [
+        (lambda v: v['gdp'] is not None and v['gdp'] > 0,
+         "GDP growth is slowing but still positive ({gdp:.1f}%)"),
+        (lambda v: v['gdp'] is not None and v['gdp'] <= 0,
+         "GDP growth has turned negative ({gdp:.1f}%)"),
+        (lambda v: v['inflation'] is not None and v['inflation'] > 3.5,
+         "inflation is elevated at {inflation:.1f}%"),
+        (lambda v: v['yield_curve'] is not None and v['yield_curve'] < 0,
+         "the yield curve is inverted ({yield_curve:.2f}% - recession warning)"),
+        (lambda v: v['unemployment'] is not None and v['unemployment'] < 4,
+         "unemployment is very low at {unemployment:.1f}% (tight labor market)"),
+    ],
+    "Contraction": [
+        (lambda v: v['gdp'] is not None and v['gdp'] < 0,
+         "GDP growth is negative at {gdp:.1f}%"),
+        (lambda v: v['unemployment'] is not None
+            and v['unemployment_trend'] is not None and v['unemployment_trend'] > 0.3,
+         "unemployment is rising rapidly (now {unemployment:.1f}%)"),
+        (lambda v: v['unemployment'] is not None and v['unemployment'] > 6
+            and not (v['unemployment_trend'] is not None and v['unemployment_trend'] > 0.3),
+         "unemployment is elevated at {unemployment:.1f}%"),
+        (lambda v: v['yield_curve'] is not None and v['yield_curve'] < -0.2,
+         "the yield curve remains deeply inverted"),
+    ],
+    "Recovery": [
+        (lambda v: v['gdp'] is not None and 0 <= v['gdp'] < 2,
+         "GDP growth is turning positive ({gdp:.1f}%)"),
+        (lambda v: v['gdp'] is not None and v['gdp'] >= 2,
+         "GDP growth is accelerating ({gdp:.1f}%)"),
+        (lambda v: v['unemployment'] is not None and v['unemployment'] > 6
+            and v['unemployment_trend'] is not None and v['unemployment_trend'] < -0.1,
+         "unemployment is high ({unemployment:.1f}%) but starting to fall"),
+        (lambda v: v['unemployment'] is not None and v['unemployment'] > 6
+            and not (v['unemployment_trend'] is not None and v['unemployment_trend'] < -0.1),
+         "unemployment remains elevated at {unemployment:.1f}%"),
+        (lambda v: v['yield_curve'] is not None and v['yield_curve'] > 0,
+         "the yield curve has normalized"),
+    ],
+}
+
+
+# Order of the values returned by extract_indicators
+INDICATOR_KEYS = ('gdp', 'unemployment', 'inflation', 'yield_curve', 'unemployment_trend')
+
+# Economic data columns read for the first four INDICATOR_KEYS
+LATEST_INDICATOR_COLUMNS = ['GDP_GROWTH', 'UNEMPLOYMENT', 'INFLATION_RATE', 'YIELD_CURVE']
+
+
+def extract_indicators(economic_data):
+    """
+    Pull the latest readings that get_cycle_explanation needs
+
+    Returns:
+        Tuple of floats in INDICATOR_KEYS order (None where unavailable)
+    """
+
+    # Get latest values - one forward-fill over the tail resolves every column
+    columns = [col for col in LATEST_INDICATOR_COLUMNS if col in economic_data.columns]
+    latest = {}
+    if columns and len(economic_data) > 0:
+        tail = economic_data[columns].tail(30).ffill().iloc[-1]
+        for col in columns:
+            value = tail[col]
+            if math.isnan(value):
+                # Nothing in the last 30 rows - fall back to the latest valid value
+                last_idx = economic_data[col].last_valid_index()
+                value = np.nan if last_idx is None else economic_data.at[last_idx, col]
+            latest[col] = float(value)
+
+    # Calculate trends (last 90 days) straight from the column array
+    unemployment_trend = None
+    if len(economic_data) > 90 and 'UNEMPLOYMENT' in economic_data.columns:
+        unemployment = economic_data['UNEMPLOYMENT'].to_numpy()
+        unemployment_trend = float(unemployment[-1] - unemployment[-90])
+
+    return tuple(latest.get(col) for col in LATEST_INDICATOR_COLUMNS) + (unemployment_trend,)
 
-        if reasons:
-            explanation += "Early recovery signs: " + ", ".join(reasons) + ". "
-        else:
-            explanation += "Economic indicators show early recovery. "
 
-        explanation += "This is often the best time to invest, as the economy rebounds from recession lows."
+@st.cache_data(ttl=3600, show_spinner=False)
+def get_cycle_explanation(stage, indicators):
+    """
+    Generate explanation for why we're in a particular cycle stage
+
+    Args:
+        stage: Current cycle stage name
+        indicators: Tuple from extract_indicators (small and cheap to hash)
+    """
+    if stage not in STAGE_RULES:
+        return f"Current stage: {stage}. Economic conditions are being analyzed."
+
+    # Normalize NaN to None once so the rule predicates only need a None check
+    values = {
+        key: None if value is None or math.isnan(value) else float(value)
+        for key, value in zip(INDICATOR_KEYS, indicators)
+    }
+    reasons = [template.format(**values) for predicate, template in STAGE_RULES[stage] if predicate(values)]
 
+    headline, lead_in, fallback, closing = STAGE_TEXT[stage]
+    explanation = headline
+    if reasons:
+        explanation += lead_in + ", ".join(reasons) + ". "
     else:
-        explanation = f"Current stage: {stage}. Economic conditions are being analyzed."
+        explanation += fallback
+    explanation += closing
 
     return explanation
 
@@ -562,6 +382,10 @@ def main():
         show_swing_trading_page()
 
 
+# Date range presets: label -> years back from today
+DATE_PRESETS = {"1 Year": 1, "2 Years": 2, "5 Years": 5, "10 Years": 10}
+
+
 def show_economic_cycle_page():
     """Economic Cycle Strategy Page"""
 
@@ -572,19 +396,14 @@ def show_economic_cycle_page():
     st.sidebar.subheader("Date Range")
     date_preset = st.sidebar.radio(
         "Quick Select:",
-        ["1 Year", "2 Years", "5 Years", "10 Years", "Maximum (2000+)", "Custom"],
+        [*DATE_PRESETS, "Maximum (2000+)", "Custom"],
         index=4  # Default to Maximum
     )
 
-    # Calculate start date based on preset
-    if date_preset == "1 Year":
-        start_date = datetime.now().replace(year=datetime.now().year - 1)
-    elif date_preset == "2 Years":
-        start_date = datetime.now().replace(year=datetime.now().year - 2)
-    elif date_preset == "5 Years":
-        start_date = datetime.now().replace(year=datetime.now().year - 5)
-    elif date_preset == "10 Years":
-        start_date = datetime.now().replace(year=datetime.now().year - 10)
+    # Calculate start date based on preset (DateOffset handles Feb 29)
+    now = datetime.now()
+    if date_preset in DATE_PRESETS:
+        start_date = (now - pd.DateOffset(years=DATE_PRESETS[date_preset])).to_pydatetime()
     elif date_preset == "Maximum (2000+)":
         start_date = datetime(2000, 1, 1)
     else:  # Custom
@@ -592,7 +411,7 @@ def show_economic_cycle_page():
             "Custom Start Date",
             value=datetime(2000, 1, 1),
             min_value=datetime(1990, 1, 1),
-            max_value=datetime.now()
+            max_value=now
         )
         start_date = datetime.combine(start_date, datetime.min.time())
 
@@ -614,6 +433,7 @@ def show_economic_cycle_page():
     )
 
     # Enhanced strategy parameters
+    enhanced_params = None
     if strategy_type in ["Enhanced (Peak + Recovery + Stop-Loss)", "Compare Both"]:
         st.sidebar.subheader("Enhanced Strategy Parameters")
 
@@ -636,66 +456,25 @@ def show_economic_cycle_page():
             step=1
         ) / 100
 
+        enhanced_params = (stay_in_peak, peak_stop, expansion_stop, include_recovery)
+
+    # Chart options
+    st.sidebar.subheader("Chart Options")
+    show_rangeslider = st.sidebar.checkbox(
+        "Show range slider",
+        value=False,
+        help="Adds a mini overview chart under the date axis (slower to draw on long date ranges)"
+    )
+
     # Run button
     run_backtest = st.sidebar.button("🚀 Run Backtest", type="primary")
 
     # Main content
     if run_backtest:
-        with st.spinner("Fetching data from FRED and Yahoo Finance..."):
-            try:
-                # Fetch data
-                start_date_str = start_date.strftime('%Y-%m-%d')
-                economic_data, spy_data = fetch_data(start_date_str)
-
-                # Classify cycles (pass start_date_str for cache key)
-                cycle_stages, classifier = classify_cycles(economic_data, start_date_str)
-
-                st.success("✓ Data loaded successfully!")
-
-                # Display current cycle stage
-                current_stage = classifier.get_current_stage()
-
-                col1, col2, col3 = st.columns(3)
-                with col1:
-                    st.metric("Current Cycle Stage", current_stage)
-                with col2:
-                    start_str = cycle_stages.index[0].strftime('%B %d, %Y')
-                    end_str = cycle_stages.index[-1].strftime('%B %d, %Y')
-                    st.metric("Data Period", f"{start_str} to {end_str}")
-                with col3:
-                    latest_price = float(spy_data['Close'].iloc[-1])
-                    st.metric("Latest SPY Price", f"${latest_price:.2f}")
-
-                # Add explanation of current stage
-                st.markdown("---")
-                st.subheader(f"Why {current_stage}?")
-
-                explanation = get_cycle_explanation(current_stage, economic_data)
-                st.info(explanation)
-
-                st.divider()
-
-                # Run backtests based on selection
-                if strategy_type == "Original (Expansion Only)":
-                    run_original_strategy(spy_data, cycle_stages, initial_capital, economic_data)
-
-                elif strategy_type == "Enhanced (Peak + Recovery + Stop-Loss)":
-                    run_enhanced_strategy(
-                        spy_data, cycle_stages, initial_capital,
-                        stay_in_peak, peak_stop, expansion_stop, include_recovery,
-                        economic_data
-                    )
-
-                else:  # Compare Both
-                    run_comparison(
-                        spy_data, cycle_stages, initial_capital,
-                        stay_in_peak, peak_stop, expansion_stop, include_recovery,
-                        economic_data
-                    )
-
-            except Exception as e:
-                st.error(f"Error: {str(e)}")
-                st.info("Make sure your FRED API key is set in config.py")
+        show_economic_results(
+            start_date.strftime('%Y-%m-%d'), initial_capital,
+            strategy_type, enhanced_params, show_rangeslider
+        )
 
     else:
         # Show instructions when not running
@@ -739,383 +518,511 @@ def show_economic_cycle_page():
             """)
 
 
-def run_original_strategy(spy_data, cycle_stages, initial_capital, economic_data):
+@st.fragment
+def show_economic_results(start_date_str, initial_capital, strategy_type,
+                          enhanced_params, show_rangeslider):
+    """
+    Fetch data, run the selected strategy and render its results
+
+    Runs as a fragment, so widgets inside the results (e.g. the download
+    button) rerun only this block instead of the whole script, and the
+    results stay on screen.
+
+    Args:
+        enhanced_params: (stay_in_peak, peak_stop, expansion_stop, include_recovery)
+                         or None for the original strategy
+    """
+    with st.spinner("Fetching data from FRED and Yahoo Finance..."):
+        try:
+            # Fetch data
+            economic_data, spy_data = fetch_data(start_date_str)
+
+            # Classify cycles (pass start_date_str for cache key)
+            cycle_stages, classifier = classify_cycles(economic_data, start_date_str)
+
+            st.success("✓ Data loaded successfully!")
+
+            # Display current cycle stage
+            current_stage = classifier.get_current_stage()
+
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("Current Cycle Stage", current_stage)
+            with col2:
+                start_str = cycle_stages.index[0].strftime('%B %d, %Y')
+                end_str = cycle_stages.index[-1].strftime('%B %d, %Y')
+                st.metric("Data Period", f"{start_str} to {end_str}")
+            with col3:
+                latest_price = float(spy_data['Close'].iloc[-1])
+                st.metric("Latest SPY Price", f"${latest_price:.2f}")
+
+            # Add explanation of current stage
+            st.markdown("---")
+            st.subheader(f"Why {current_stage}?")
+
+            explanation = get_cycle_explanation(current_stage, extract_indicators(economic_data))
+            st.info(explanation)
+
+            st.divider()
+
+            # Run backtests based on selection
+            if strategy_type == "Original (Expansion Only)":
+                run_original_strategy(start_date_str, initial_capital, show_rangeslider)
+
+            elif strategy_type == "Enhanced (Peak + Recovery + Stop-Loss)":
+                run_enhanced_strategy(
+                    start_date_str, initial_capital, *enhanced_params, show_rangeslider
+                )
+
+            else:  # Compare Both
+                run_comparison(
+                    start_date_str, initial_capital, *enhanced_params, show_rangeslider
+                )
+
+        except Exception as e:
+            st.error(f"Error: {str(e)}")
+            st.info("Make sure your FRED API key is set in config.py")
+
+
+def run_original_strategy(start_date, initial_capital, show_rangeslider=False):
     """Run original strategy"""
     st.header("Original Strategy: Long Expansion Only")
 
     with st.spinner("Running backtest..."):
-        backtester = Backtester(spy_data, cycle_stages, initial_capital)
-        results = backtester.run_strategy(long_stages=['Expansion'])
+        results, metrics, trades = run_original_backtest(start_date, initial_capital)
 
         # Display metrics
-        display_metrics(backtester, "Original Strategy")
+        display_metrics(flatten_metrics(metrics), "Original Strategy")
 
         # Display charts
-        display_charts(results, backtester, "Original Strategy")
+        display_charts(results, "Original Strategy", show_rangeslider)
 
         # Display trades
-        display_trades(backtester)
+        display_trades(trades)
 
 
-def run_enhanced_strategy(spy_data, cycle_stages, initial_capital,
+def run_enhanced_strategy(start_date, initial_capital,
                          stay_in_peak, peak_stop, expansion_stop, include_recovery,
-                         economic_data):
+                         show_rangeslider=False):
     """Run enhanced strategy"""
     st.header("Enhanced Strategy: Peak + Recovery + Stop-Loss")
 
     with st.spinner("Running enhanced backtest..."):
-        backtester = BacktesterEnhanced(spy_data, cycle_stages, initial_capital)
-        results = backtester.run_enhanced_strategy(
-            stay_in_peak=stay_in_peak,
-            peak_stop_loss=peak_stop,
-            expansion_stop_loss=expansion_stop,
-            include_recovery=include_recovery
+        results, metrics, trades = run_enhanced_backtest(
+            start_date, initial_capital,
+            stay_in_peak, peak_stop, expansion_stop, include_recovery
         )
 
         # Display metrics
-        display_metrics(backtester, "Enhanced Strategy")
+        display_metrics(flatten_metrics(metrics), "Enhanced Strategy")
 
         # Display charts
-        display_charts(results, backtester, "Enhanced Strategy")
+        display_charts(results, "Enhanced Strategy", show_rangeslider)
 
         # Display trades
-        display_trades(backtester)
+        display_trades(trades)
+
 
+# Rows of the strategy comparison table: (label, metrics section, key, format)
+COMPARISON_ROWS = [
+    ('Total Return', 'strategy', 'total_return', '{:.2f}%'),
+    ('Annual Return', 'strategy', 'annual_return', '{:.2f}%'),
+    ('Volatility', 'strategy', 'volatility', '{:.2f}%'),
+    ('Sharpe Ratio', 'strategy', 'sharpe_ratio', '{:.2f}'),
+    ('Max Drawdown', 'strategy', 'max_drawdown', '{:.2f}%'),
+    ('Final Value', 'strategy', 'final_value', '${:,.0f}'),
+    ('Total Trades', 'trades', 'total_trades', '{:.0f}'),
+    ('Win Rate', 'trades', 'win_rate', '{:.1f}%'),
+]
 
-def run_comparison(spy_data, cycle_stages, initial_capital,
+
+def run_comparison(start_date, initial_capital,
                   stay_in_peak, peak_stop, expansion_stop, include_recovery,
-                  economic_data):
+                  show_rangeslider=False):
     """Run comparison of both strategies"""
     st.header("Strategy Comparison: Original vs Enhanced")
 
     with st.spinner("Running both backtests..."):
         # Original
-        bt_orig = Backtester(spy_data, cycle_stages, initial_capital)
-        results_orig = bt_orig.run_strategy(long_stages=['Expansion'])
+        results_orig, metrics_orig, _ = run_original_backtest(start_date, initial_capital)
 
         # Enhanced
-        bt_enh = BacktesterEnhanced(spy_data, cycle_stages, initial_capital)
-        results_enh = bt_enh.run_enhanced_strategy(
-            stay_in_peak=stay_in_peak,
-            peak_stop_loss=peak_stop,
-            expansion_stop_loss=expansion_stop,
-            include_recovery=include_recovery
+        results_enh, metrics_enh, _ = run_enhanced_backtest(
+            start_date, initial_capital,
+            stay_in_peak, peak_stop, expansion_stop, include_recovery
         )
 
         # Comparison table
         st.subheader("📊 Performance Comparison")
 
-        comparison_df = pd.DataFrame({
-            'Metric': [
-                'Total Return',
-                'Annual Return',
-                'Volatility',
-                'Sharpe Ratio',
-                'Max Drawdown',
-                'Final Value',
-                'Total Trades',
-                'Win Rate'
-            ],
-            'Original': [
-                f"{bt_orig.metrics['strategy']['total_return']:.2f}%",
-                f"{bt_orig.metrics['strategy']['annual_return']:.2f}%",
-                f"{bt_orig.metrics['strategy']['volatility']:.2f}%",
-                f"{bt_orig.metrics['strategy']['sharpe_ratio']:.2f}",
-                f"{bt_orig.metrics['strategy']['max_drawdown']:.2f}%",
-                f"${bt_orig.metrics['strategy']['final_value']:,.0f}",
-                f"{bt_orig.metrics['trades']['total_trades']:.0f}",
-                f"{bt_orig.metrics['trades']['win_rate']:.1f}%"
-            ],
-            'Enhanced': [
-                f"{bt_enh.metrics['strategy']['total_return']:.2f}%",
-                f"{bt_enh.metrics['strategy']['annual_return']:.2f}%",
-                f"{bt_enh.metrics['strategy']['volatility']:.2f}%",
-                f"{bt_enh.metrics['strategy']['sharpe_ratio']:.2f}",
-                f"{bt_enh.metrics['strategy']['max_drawdown']:.2f}%",
-                f"${bt_enh.metrics['strategy']['final_value']:,.0f}",
-                f"{bt_enh.metrics['trades']['total_trades']:.0f}",
-                f"{bt_enh.metrics['trades']['win_rate']:.1f}%"
-            ],
-            'Buy & Hold': [
-                f"{bt_orig.metrics['buyhold']['total_return']:.2f}%",
-                f"{bt_orig.metrics['buyhold']['annual_return']:.2f}%",
-                f"{bt_orig.metrics['buyhold']['volatility']:.2f}%",
-                f"{bt_orig.metrics['buyhold']['sharpe_ratio']:.2f}",
-                f"{bt_orig.metrics['buyhold']['max_drawdown']:.2f}%",
-                f"${bt_orig.metrics['buyhold']['final_value']:,.0f}",
-                "0",
-                "N/A"
-            ]
-        })
-
-        st.dataframe(comparison_df, width='stretch')
+        buyhold_trades = {'total_trades': 0, 'win_rate': np.nan}
+        columns = {
+            'Original': (metrics_orig['strategy'], metrics_orig['trades']),
+            'Enhanced': (metrics_enh['strategy'], metrics_enh['trades']),
+            'Buy & Hold': (metrics_orig['buyhold'], buyhold_trades),
+        }
+
+        # Build one record per metric row and construct the frame in one call
+        rows = [
+            (label, *(
+                (performance if section == 'strategy' else trade_stats)[key]
+                for performance, trade_stats in columns.values()
+            ))
+            for label, section, key, _ in COMPARISON_ROWS
+        ]
+        comparison_df = pd.DataFrame.from_records(rows, columns=['Metric', *columns])
+
+        # Format each row for display while keeping the underlying values numeric
+        styled_comparison = comparison_df.style
+        for i, (_, _, _, fmt) in enumerate(COMPARISON_ROWS):
+            styled_comparison = styled_comparison.format(
+                fmt, subset=pd.IndexSlice[i, list(columns)], na_rep='N/A'
+            )
+
+        # Fixed column widths spare the frontend its per-cell auto-sizing pass
+        st.dataframe(
+            styled_comparison,
+            width='stretch',
+            hide_index=True,
+            column_config={
+                'Metric': st.column_config.Column(width='medium'),
+                **{name: st.column_config.Column(width='small') for name in columns},
+            }
+        )
 
         # Winner announcement
         best_return = max(
-            bt_orig.metrics['strategy']['total_return'],
-            bt_enh.metrics['strategy']['total_return'],
-            bt_orig.metrics['buyhold']['total_return']
+            metrics_orig['strategy']['total_return'],
+            metrics_enh['strategy']['total_return'],
+            metrics_orig['buyhold']['total_return']
         )
 
-        if bt_enh.metrics['strategy']['total_return'] == best_return:
+        if metrics_enh['strategy']['total_return'] == best_return:
             st.success("🏆 Enhanced Strategy is the winner!")
-        elif bt_orig.metrics['strategy']['total_return'] == best_return:
+        elif metrics_orig['strategy']['total_return'] == best_return:
             st.success("🏆 Original Strategy is the winner!")
         else:
             st.info("🏆 Buy & Hold is the winner!")
 
         # Comparison chart
-        display_comparison_chart(results_orig, results_enh)
+        display_comparison_chart(results_orig, results_enh, show_rangeslider)
+
+
+def flatten_metrics(metrics):
+    """Reduce a backtester metrics dict to the flat values display_metrics shows"""
+    strategy = metrics['strategy']
+    trades = metrics['trades']
+    return {
+        'total_return': strategy['total_return'],
+        'excess_return': strategy['total_return'] - metrics['buyhold']['total_return'],
+        'annual_return': strategy['annual_return'],
+        'sharpe_ratio': strategy['sharpe_ratio'],
+        'volatility': strategy['volatility'],
+        'max_drawdown': strategy['max_drawdown'],
+        'final_value': strategy['final_value'],
+        'total_trades': trades['total_trades'],
+        'win_rate': trades['win_rate'],
+    }
+
+
+# Display format for each flatten_metrics() value
+METRIC_FORMATS = {
+    'total_return': '{:.2f}%',
+    'excess_return': '{:.2f}% vs B&H',
+    'annual_return': '{:.2f}%',
+    'sharpe_ratio': '{:.2f}',
+    'volatility': '{:.2f}%',
+    'max_drawdown': '{:.2f}%',
+    'final_value': '${:,.0f}',
+    'total_trades': '{:.0f}',
+    'win_rate': '{:.1f}%',
+}
 
 
-def display_metrics(backtester, title):
-    """Display performance metrics"""
+@st.cache_data(show_spinner=False)
+def format_metrics(metrics):
+    """Format a flatten_metrics() dict once per distinct backtest result"""
+    return {key: fmt.format(metrics[key]) for key, fmt in METRIC_FORMATS.items()}
+
+
+def display_metrics(metrics, title):
+    """Display performance metrics from a flatten_metrics() dict"""
     st.subheader("📈 Performance Metrics")
 
-    m = backtester.metrics
+    m = format_metrics(metrics)
 
     col1, col2, col3, col4 = st.columns(4)
 
     with col1:
-        st.metric(
-            "Total Return",
-            f"{m['strategy']['total_return']:.2f}%",
-            delta=f"{m['strategy']['total_return'] - m['buyhold']['total_return']:.2f}% vs B&H"
-        )
-        st.metric("Annual Return", f"{m['strategy']['annual_return']:.2f}%")
+        st.metric("Total Return", m['total_return'], delta=m['excess_return'])
+        st.metric("Annual Return", m['annual_return'])
 
     with col2:
-        st.metric("Sharpe Ratio", f"{m['strategy']['sharpe_ratio']:.2f}")
-        st.metric("Volatility", f"{m['strategy']['volatility']:.2f}%")
+        st.metric("Sharpe Ratio", m['sharpe_ratio'])
+        st.metric("Volatility", m['volatility'])
 
     with col3:
-        st.metric("Max Drawdown", f"{m['strategy']['max_drawdown']:.2f}%")
-        st.metric("Final Value", f"${m['strategy']['final_value']:,.0f}")
+        st.metric("Max Drawdown", m['max_drawdown'])
+        st.metric("Final Value", m['final_value'])
 
     with col4:
-        st.metric("Total Trades", f"{m['trades']['total_trades']:.0f}")
-        st.metric("Win Rate", f"{m['trades']['win_rate']:.1f}%")
+        st.metric("Total Trades", m['total_trades'])
+        st.metric("Win Rate", m['win_rate'])
 
 
-def display_charts(results, backtester, title):
+def display_charts(results, title, show_rangeslider=False):
     """Display interactive charts using Plotly"""
     st.subheader("📊 Performance Charts")
 
+    # Only hand the plotted columns to the cached builder so the cache key
+    # hashes three numeric columns rather than the whole results frame
+    fig = build_performance_figure(results[CHART_COLUMNS], show_rangeslider)
+    # Stable key keeps the mounted chart so reruns update it in place
+    st.plotly_chart(fig, use_container_width=True, key=f"performance_chart_{title}")
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def compute_drawdown(values):
+    """Percent drawdown from the running peak - cached on the equity array bytes"""
+    return drawdown(values)
+
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def build_performance_figure(results, show_rangeslider=False):
+    """Build the equity/drawdown/position figure - cached on results content"""
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
     # Create subplots
     fig = make_subplots(
         rows=3, cols=1,
-        subplot_titles=('Portfolio Value', 'Drawdown', 'Position'),
+        subplot_titles=PERFORMANCE_SUBPLOT_TITLES,
         vertical_spacing=0.08,
         row_heights=[0.4, 0.3, 0.3]
     )
 
+    # Equity curves are smooth lines, so LTTB keeps their shape best
+    strategy_value = lttb(results['strategy_value'])
+    buyhold_value = lttb(results['buyhold_value'])
+    position = downsample(results['position'])
+
     # Plot 1: Equity curves
     fig.add_trace(
-        go.Scatter(x=results.index, y=results['strategy_value'],
+        go.Scattergl(x=strategy_value.index.to_numpy(), y=strategy_value.to_numpy(),
                   name='Strategy', line=dict(color='blue', width=2)),
         row=1, col=1
     )
     fig.add_trace(
-        go.Scatter(x=results.index, y=results['buyhold_value'],
+        go.Scattergl(x=buyhold_value.index.to_numpy(), y=buyhold_value.to_numpy(),
                   name='Buy & Hold', line=dict(color='gray', width=2, dash='dash')),
         row=1, col=1
     )
 
     # Plot 2: Drawdown
-    strategy_peak = results['strategy_value'].expanding().max()
-    strategy_dd = (results['strategy_value'] - strategy_peak) / strategy_peak * 100
+    strategy_dd = pd.Series(compute_drawdown(results['strategy_value'].to_numpy()), index=results.index)
+    buyhold_dd = pd.Series(compute_drawdown(results['buyhold_value'].to_numpy()), index=results.index)
 
-    buyhold_peak = results['buyhold_value'].expanding().max()
-    buyhold_dd = (results['buyhold_value'] - buyhold_peak) / buyhold_peak * 100
+    # Thin long series so the browser only draws what fits on screen
+    strategy_dd = downsample(strategy_dd)
+    buyhold_dd = downsample(buyhold_dd)
 
     fig.add_trace(
-        go.Scatter(x=results.index, y=strategy_dd,
+        go.Scattergl(x=strategy_dd.index.to_numpy(), y=strategy_dd.to_numpy(),
                   name='Strategy DD', fill='tozeroy', line=dict(color='blue')),
         row=2, col=1
     )
     fig.add_trace(
-        go.Scatter(x=results.index, y=buyhold_dd,
+        go.Scattergl(x=buyhold_dd.index.to_numpy(), y=buyhold_dd.to_numpy(),
                   name='B&H DD', fill='tozeroy', line=dict(color='gray'), opacity=0.5),
         row=2, col=1
     )
 
     # Plot 3: Position
     fig.add_trace(
-        go.Scatter(x=results.index, y=results['position'],
+        go.Scattergl(x=position.index.to_numpy(), y=position.to_numpy(),
                   name='Position (1=Long, 0=Cash)', fill='tozeroy', line=dict(color='green')),
         row=3, col=1
     )
 
-    # Update layout
-    fig.update_yaxes(title_text="Value ($)", row=1, col=1)
-    fig.update_yaxes(title_text="Drawdown (%)", row=2, col=1)
-    fig.update_yaxes(
-        title_text="Position (1=Long SPY, 0=Cash)",
-        tickvals=[0, 1],
-        ticktext=['Cash<br>(Out of Market)', 'Long SPY<br>(In Market)'],
-        row=3, col=1
-    )
-    fig.update_xaxes(title_text="Date", row=3, col=1)
-
-    # Add range slider and selector buttons
-    fig.update_xaxes(
-        rangeselector=dict(
-            buttons=list([
-                dict(count=1, label="1M", step="month", stepmode="backward"),
-                dict(count=3, label="3M", step="month", stepmode="backward"),
-                dict(count=6, label="6M", step="month", stepmode="backward"),
-                dict(count=1, label="1Y", step="year", stepmode="backward"),
-                dict(count=2, label="2Y", step="year", stepmode="backward"),
-                dict(count=5, label="5Y", step="year", stepmode="backward"),
-                dict(step="all", label="All")
-            ]),
-            bgcolor="lightgray",
-            activecolor="darkgray"
-        ),
-        rangeslider=dict(visible=True),
-        row=3, col=1
-    )
-
+    # Update layout - axes are styled in the same call (xaxis3/yaxis3 = row 3)
     fig.update_layout(
+        BASE_LAYOUT,
         height=900,
-        showlegend=True,
-        hovermode='x unified',
-        plot_bgcolor='white',
-        paper_bgcolor='white',
-        font=dict(color='#1d1d1f', size=12),
-        xaxis=dict(color='#1d1d1f'),
-        yaxis=dict(color='#1d1d1f'),
-        title_font=dict(color='#1d1d1f')
+        # Constant uirevision keeps the user's zoom/pan when a rerun swaps in new data
+        uirevision='performance',
+        title_font=dict(color='#1d1d1f'),
+        xaxis=dict(AXIS_STYLE, color='#1d1d1f'),
+        xaxis2=AXIS_STYLE,
+        xaxis3=dict(
+            AXIS_STYLE,
+            title_text="Date",
+            # Selector buttons (range slider is opt-in - it redraws every trace)
+            rangeselector=RANGESELECTOR,
+            rangeslider=dict(visible=show_rangeslider)
+        ),
+        yaxis=dict(AXIS_STYLE, title_text="Value ($)", color='#1d1d1f'),
+        yaxis2=dict(AXIS_STYLE, title_text="Drawdown (%)"),
+        yaxis3=dict(
+            AXIS_STYLE,
+            title_text="Position (1=Long SPY, 0=Cash)",
+            tickvals=[0, 1],
+            ticktext=['Cash<br>(Out of Market)', 'Long SPY<br>(In Market)']
+        )
     )
 
-    # Make all axis text dark
-    fig.update_xaxes(tickfont=dict(color='#1d1d1f'), title_font=dict(color='#1d1d1f'))
-    fig.update_yaxes(tickfont=dict(color='#1d1d1f'), title_font=dict(color='#1d1d1f'))
-
-    st.plotly_chart(fig, use_container_width=True)
+    return fig
 
 
-def display_comparison_chart(results_orig, results_enh):
+def display_comparison_chart(results_orig, results_enh, show_rangeslider=False):
     """Display comparison chart"""
     st.subheader("📊 Comparison Charts")
 
+    fig = build_comparison_figure(
+        results_orig[CHART_COLUMNS], results_enh[CHART_COLUMNS], show_rangeslider
+    )
+    st.plotly_chart(fig, use_container_width=True, key="comparison_chart")
+
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def build_comparison_figure(results_orig, results_enh, show_rangeslider=False):
+    """Build the original vs enhanced comparison figure - cached on results content"""
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
     fig = make_subplots(
         rows=2, cols=1,
-        subplot_titles=('Portfolio Value Comparison', 'Position Comparison'),
+        subplot_titles=COMPARISON_SUBPLOT_TITLES,
         vertical_spacing=0.12
     )
 
+    orig_value = lttb(results_orig['strategy_value'])
+    enh_value = lttb(results_enh['strategy_value'])
+    buyhold_value = lttb(results_orig['buyhold_value'])
+    orig_position = downsample(results_orig['position'])
+    enh_position = downsample(results_enh['position'])
+
     # Equity curves
     fig.add_trace(
-        go.Scatter(x=results_orig.index, y=results_orig['strategy_value'],
+        go.Scattergl(x=orig_value.index.to_numpy(), y=orig_value.to_numpy(),
                   name='Original', line=dict(color='blue', width=2)),
         row=1, col=1
     )
     fig.add_trace(
-        go.Scatter(x=results_enh.index, y=results_enh['strategy_value'],
+        go.Scattergl(x=enh_value.index.to_numpy(), y=enh_value.to_numpy(),
                   name='Enhanced', line=dict(color='green', width=2)),
         row=1, col=1
     )
     fig.add_trace(
-        go.Scatter(x=results_orig.index, y=results_orig['buyhold_value'],
+        go.Scattergl(x=buyhold_value.index.to_numpy(), y=buyhold_value.to_numpy(),
                   name='Buy & Hold', line=dict(color='gray', width=2, dash='dash')),
         row=1, col=1
     )
 
     # Positions
     fig.add_trace(
-        go.Scatter(x=results_orig.index, y=results_orig['position'],
+        go.Scattergl(x=orig_position.index.to_numpy(), y=orig_position.to_numpy(),
                   name='Original (1=Long, 0=Cash)', fill='tozeroy', line=dict(color='blue'), opacity=0.5),
         row=2, col=1
     )
     fig.add_trace(
-        go.Scatter(x=results_enh.index, y=results_enh['position'],
+        go.Scattergl(x=enh_position.index.to_numpy(), y=enh_position.to_numpy(),
                   name='Enhanced (1=Long, 0=Cash)', fill='tozeroy', line=dict(color='green'), opacity=0.7),
         row=2, col=1
     )
 
-    fig.update_yaxes(title_text="Value ($)", row=1, col=1)
-    fig.update_yaxes(
-        title_text="Position (1=Long SPY, 0=Cash)",
-        tickvals=[0, 1],
-        ticktext=['Cash<br>(Out of Market)', 'Long SPY<br>(In Market)'],
-        row=2, col=1
-    )
-    fig.update_xaxes(title_text="Date", row=2, col=1)
-
-    # Add range slider and selector buttons
-    fig.update_xaxes(
-        rangeselector=dict(
-            buttons=list([
-                dict(count=1, label="1M", step="month", stepmode="backward"),
-                dict(count=3, label="3M", step="month", stepmode="backward"),
-                dict(count=6, label="6M", step="month", stepmode="backward"),
-                dict(count=1, label="1Y", step="year", stepmode="backward"),
-                dict(count=2, label="2Y", step="year", stepmode="backward"),
-                dict(count=5, label="5Y", step="year", stepmode="backward"),
-                dict(step="all", label="All")
-            ]),
-            bgcolor="lightgray",
-            activecolor="darkgray"
-        ),
-        rangeslider=dict(visible=True),
-        row=2, col=1
-    )
-
+    # Update layout - axes are styled in the same call (xaxis2/yaxis2 = row 2)
     fig.update_layout(
+        BASE_LAYOUT,
         height=700,
-        showlegend=True,
-        hovermode='x unified',
-        plot_bgcolor='white',
-        paper_bgcolor='white',
-        font=dict(color='#1d1d1f', size=12),
-        xaxis=dict(color='#1d1d1f'),
-        yaxis=dict(color='#1d1d1f'),
+        uirevision='comparison',
         title_font=dict(color='#1d1d1f'),
         legend=dict(
             bgcolor='white',
             bordercolor='#d2d2d7',
             borderwidth=1,
             font=dict(color='#1d1d1f')
+        ),
+        xaxis=dict(AXIS_STYLE, color='#1d1d1f'),
+        xaxis2=dict(
+            AXIS_STYLE,
+            title_text="Date",
+            # Selector buttons (range slider is opt-in - it redraws every trace)
+            rangeselector=RANGESELECTOR,
+            rangeslider=dict(visible=show_rangeslider)
+        ),
+        yaxis=dict(AXIS_STYLE, title_text="Value ($)", color='#1d1d1f'),
+        yaxis2=dict(
+            AXIS_STYLE,
+            title_text="Position (1=Long SPY, 0=Cash)",
+            tickvals=[0, 1],
+            ticktext=['Cash<br>(Out of Market)', 'Long SPY<br>(In Market)']
         )
     )
 
-    # Make all axis text and subplot titles dark
-    fig.update_xaxes(tickfont=dict(color='#1d1d1f'), title_font=dict(color='#1d1d1f'))
-    fig.update_yaxes(tickfont=dict(color='#1d1d1f'), title_font=dict(color='#1d1d1f'))
+    # Make subplot titles dark
     fig.update_annotations(font=dict(color='#1d1d1f', size=14))
 
-    st.plotly_chart(fig, use_container_width=True)
+    return fig
+
+
+def color_returns(values):
+    """CSS text colors for a column of returns - green for gains, red otherwise"""
+    return np.where(values.to_numpy() > 0, 'color: green', 'color: red')
+
+
+# Fixed height for trade logs - the grid virtualizes rows instead of sizing to fit
+TRADE_TABLE_HEIGHT = 400
+
+# Trade logs longer than this only show their most recent rows unless the
+# user ticks 'Show all trades' (the CSV always has every row)
+TRADE_TABLE_MAX_ROWS = 500
 
 
-def display_trades(backtester):
+@st.cache_data(show_spinner=False)
+def trades_to_csv(trades):
+    """Serialize trades to CSV bytes - cached so reruns skip re-encoding"""
+    return trades.to_csv(index=False).encode('utf-8')
+
+
+def display_trades(trades):
     """Display trade history"""
     st.subheader("📝 Trade History")
 
-    trades = backtester.trades
-
     if trades is not None and len(trades) > 0:
-        # Format dates
-        display_trades = trades.copy()
-        display_trades['entry_date'] = pd.to_datetime(display_trades['entry_date']).dt.date
-        display_trades['exit_date'] = pd.to_datetime(display_trades['exit_date']).dt.date
+        # Long logs show their most recent rows unless asked for all of them;
+        # this runs inside the results fragment, so ticking the box reruns
+        # only the fragment and the results stay on screen
+        show_all = len(trades) > TRADE_TABLE_MAX_ROWS and \
+            st.checkbox("Show all trades", key="show_all_trades")
+
+        # Only format and style the rows that are actually shown
+        view = trades if show_all else trades.tail(TRADE_TABLE_MAX_ROWS)
+
+        # Format dates (backtester already emits datetime64, so only convert if needed)
+        def as_dates(col):
+            dates = view[col]
+            if not pd.api.types.is_datetime64_any_dtype(dates):
+                dates = pd.to_datetime(dates)
+            return dates.dt.date
+
+        # assign only materializes the two replaced columns
+        display_trades = view.assign(
+            entry_date=as_dates('entry_date'),
+            exit_date=as_dates('exit_date')
+        )
 
         # Color code returns
-        def color_returns(val):
-            if isinstance(val, (int, float)):
-                color = 'green' if val > 0 else 'red'
-                return f'color: {color}'
-            return ''
-
-        styled_trades = display_trades.style.map(
+        styled_trades = display_trades.style.apply(
             color_returns,
             subset=['return_pct']
         )
 
-        st.dataframe(styled_trades, width='stretch')
+        st.dataframe(styled_trades, width='stretch', height=TRADE_TABLE_HEIGHT)
+        if len(view) < len(trades):
+            st.caption(f"Showing the most recent {len(view)} of {len(trades)} trades - tick 'Show all trades' or download the CSV for the full history")
 
         # Download button
-        csv = trades.to_csv(index=False)
+        csv = trades_to_csv(trades)
         st.download_button(
             label="📥 Download Trade History as CSV",
             data=csv,
@@ -1257,9 +1164,10 @@ def show_swing_trading_page():
     if run_swing_backtest:
         with st.spinner(f"Fetching {symbol} 30-minute data from Polygon.io..."):
             try:
+                from swing_backtester import SwingBacktester
+
                 # Fetch intraday data
-                fetcher = IntradayDataFetcher()
-                intraday_data = fetcher.fetch_30min_bars(symbol, days_back=days_back)
+                intraday_data = fetch_intraday_data(symbol, days_back)
 
                 # Fetch economic data if using filter
                 economic_expansion = None
@@ -1269,27 +1177,7 @@ def show_swing_trading_page():
                             # Need more historical data for cycle classification (requires 180+ days)
                             lookback_days = max(days_back, 365)  # At least 1 year
                             start_date = (datetime.now() - pd.Timedelta(days=lookback_days)).strftime('%Y-%m-%d')
-                            economic_data, _ = fetch_data(start_date)
-                            cycle_stages, _ = classify_cycles(economic_data, start_date)
-
-                            # Create expansion filter with DatetimeIndex
-                            economic_expansion = (cycle_stages == 'Expansion').copy()
-
-                            # Ensure index is DatetimeIndex
-                            if not isinstance(economic_expansion.index, pd.DatetimeIndex):
-                                # Try to convert to DatetimeIndex
-                                try:
-                                    economic_expansion.index = pd.to_datetime(economic_expansion.index)
-                                except Exception as idx_err:
-                                    # If conversion fails, create a new series with proper index
-                                    economic_expansion = pd.Series(
-                                        economic_expansion.values,
-                                        index=pd.to_datetime(economic_expansion.index),
-                                        name='expansion'
-                                    )
-
-                            # Sort by index to ensure asof works properly
-                            economic_expansion = economic_expansion.sort_index()
+                            economic_expansion = get_expansion_series(start_date)
 
                             expansion_days = economic_expansion.sum()
                             if expansion_days == 0:
@@ -1413,53 +1301,74 @@ def display_swing_results(backtester, symbol):
 
 def display_swing_charts(backtester, symbol):
     """Display swing trading charts"""
-
     st.subheader("📊 Performance Charts")
 
-    results = backtester.results
+    # Only the plotted columns go into the cached builder's key
+    fig = build_swing_figure(backtester.results[SWING_CHART_COLUMNS], symbol)
+    st.plotly_chart(fig, use_container_width=True, key="swing_chart")
+
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def build_swing_figure(results, symbol):
+    """Build the price/RSI/equity/position swing figure - cached on results content"""
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
 
     # Create subplots
     fig = make_subplots(
         rows=4, cols=1,
-        subplot_titles=(
-            f'{symbol} Price with Bollinger Bands',
-            'RSI Indicator',
-            'Equity Curve',
-            'Position'
-        ),
+        subplot_titles=(SWING_SUBPLOT_TITLES[0].format(symbol=symbol), *SWING_SUBPLOT_TITLES[1:]),
         vertical_spacing=0.08,
         row_heights=[0.3, 0.2, 0.3, 0.2]
     )
 
+    # Thin every 30-minute line before it is sent to the browser - LTTB for
+    # the smooth lines, min/max for the 0/1 position steps. The sparse
+    # buy/sell markers below are plotted unthinned.
+    close = lttb(results['close'])
+    bb_upper = lttb(results['bb_upper'])
+    bb_middle = lttb(results['bb_middle'])
+    bb_lower = lttb(results['bb_lower'])
+    rsi = lttb(results['rsi'])
+    equity = lttb(results['equity'])
+    in_market = pd.Series((results['position'].to_numpy() > 0).astype(np.int8), index=results.index)
+    position = downsample(in_market)
+
     # Plot 1: Price with Bollinger Bands
     fig.add_trace(
-        go.Scatter(x=results.index, y=results['close'],
+        go.Scattergl(x=close.index.to_numpy(), y=close.to_numpy(),
                   name='Close', line=dict(color='black', width=1)),
         row=1, col=1
     )
+    # Upper and lower bands share one trace, broken by a NaN point
+    band_x = np.concatenate([bb_upper.index.to_numpy(), bb_upper.index.to_numpy()[-1:],
+                             bb_lower.index.to_numpy()])
+    band_y = np.concatenate([bb_upper.to_numpy(), [np.nan], bb_lower.to_numpy()])
     fig.add_trace(
-        go.Scatter(x=results.index, y=results['bb_upper'],
-                  name='BB Upper', line=dict(color='red', width=1, dash='dash')),
+        go.Scattergl(x=band_x, y=band_y, connectgaps=False, hoverinfo='skip',
+                  name='BB Upper/Lower', line=dict(color='gray', width=1, dash='dash')),
         row=1, col=1
     )
     fig.add_trace(
-        go.Scatter(x=results.index, y=results['bb_middle'],
+        go.Scattergl(x=bb_middle.index.to_numpy(), y=bb_middle.to_numpy(), hoverinfo='skip',
                   name='BB Middle', line=dict(color='blue', width=1, dash='dot')),
         row=1, col=1
     )
-    fig.add_trace(
-        go.Scatter(x=results.index, y=results['bb_lower'],
-                  name='BB Lower', line=dict(color='green', width=1, dash='dash')),
-        row=1, col=1
-    )
 
-    # Add buy/sell signals
-    buy_signals = results[results['signal'] == 'BUY']
-    sell_signals = results[results['signal'].str.contains('SELL', na=False)]
+    # Add buy/sell signals - match on the few category codes, not per-row strings
+    signals = results['signal']
+    if not isinstance(signals.dtype, pd.CategoricalDtype):
+        signals = signals.astype('category')
+    categories = signals.cat.categories
+    codes = signals.cat.codes.to_numpy()
+    buy_codes = [i for i, c in enumerate(categories) if c == 'BUY']
+    sell_codes = [i for i, c in enumerate(categories) if c.startswith('SELL')]
+    buy_signals = results[np.isin(codes, buy_codes)]
+    sell_signals = results[np.isin(codes, sell_codes)]
 
     if len(buy_signals) > 0:
         fig.add_trace(
-            go.Scatter(x=buy_signals.index, y=buy_signals['close'],
+            go.Scattergl(x=buy_signals.index.to_numpy(), y=buy_signals['close'].to_numpy(),
                       mode='markers', name='Buy',
                       marker=dict(color='green', size=10, symbol='triangle-up')),
             row=1, col=1
@@ -1467,7 +1376,7 @@ def display_swing_charts(backtester, symbol):
 
     if len(sell_signals) > 0:
         fig.add_trace(
-            go.Scatter(x=sell_signals.index, y=sell_signals['close'],
+            go.Scattergl(x=sell_signals.index.to_numpy(), y=sell_signals['close'].to_numpy(),
                       mode='markers', name='Sell',
                       marker=dict(color='red', size=10, symbol='triangle-down')),
             row=1, col=1
@@ -1475,7 +1384,7 @@ def display_swing_charts(backtester, symbol):
 
     # Plot 2: RSI
     fig.add_trace(
-        go.Scatter(x=results.index, y=results['rsi'],
+        go.Scattergl(x=rsi.index.to_numpy(), y=rsi.to_numpy(),
                   name='RSI', line=dict(color='purple', width=2)),
         row=2, col=1
     )
@@ -1485,14 +1394,14 @@ def display_swing_charts(backtester, symbol):
 
     # Plot 3: Equity curve
     fig.add_trace(
-        go.Scatter(x=results.index, y=results['equity'],
+        go.Scattergl(x=equity.index.to_numpy(), y=equity.to_numpy(),
                   name='Equity', line=dict(color='blue', width=2), fill='tozeroy'),
         row=3, col=1
     )
 
     # Plot 4: Position
     fig.add_trace(
-        go.Scatter(x=results.index, y=(results['position'] > 0).astype(int),
+        go.Scattergl(x=position.index.to_numpy(), y=position.to_numpy(),
                   name='Position', fill='tozeroy', line=dict(color='green')),
         row=4, col=1
     )
@@ -1513,12 +1422,11 @@ def display_swing_charts(backtester, symbol):
     fig.update_xaxes(title_text="Time", row=4, col=1)
 
     fig.update_layout(
+        BASE_LAYOUT,
         height=1000,
-        showlegend=True,
-        hovermode='x unified',
-        plot_bgcolor='white',
-        paper_bgcolor='white',
-        font=dict(color='#1d1d1f', size=12),
+        uirevision='swing',
+        # Nearest-point hover - a unified x-scan across every trace lags on intraday data
+        hovermode='closest',
         legend=dict(
             bgcolor='white',
             bordercolor='#d2d2d7',
@@ -1528,56 +1436,75 @@ def display_swing_charts(backtester, symbol):
     )
 
     # Make all axis text dark
-    fig.update_xaxes(tickfont=dict(color='#1d1d1f'), title_font=dict(color='#1d1d1f'))
-    fig.update_yaxes(tickfont=dict(color='#1d1d1f'), title_font=dict(color='#1d1d1f'))
+    fig.update_xaxes(AXIS_STYLE)
+    fig.update_yaxes(AXIS_STYLE)
 
     # Update subplot titles to be dark
     fig.update_annotations(font=dict(color='#1d1d1f', size=14))
 
-    st.plotly_chart(fig, use_container_width=True)
+    return fig
 
 
+@st.fragment
 def display_swing_trades(backtester):
-    """Display swing trade history"""
+    """
+    Display swing trade history
+
+    Runs as a fragment, so the 'Show all trades' checkbox reruns only this
+    block instead of the whole script, and the backtest results stay on
+    screen.
+    """
 
     st.subheader("📝 Trade History")
 
     trades_df = backtester.get_trades_df()
 
     if len(trades_df) > 0:
+        # Long logs show their most recent rows unless asked for all of them
+        show_all = len(trades_df) > TRADE_TABLE_MAX_ROWS and \
+            st.checkbox("Show all trades", key="show_all_swing_trades")
+
+        # Only format and style the rows that are actually shown
+        view = trades_df if show_all else trades_df.tail(TRADE_TABLE_MAX_ROWS)
+
         # Format display
-        display_df = trades_df.copy()
-        display_df['entry_time'] = pd.to_datetime(display_df['entry_time']).dt.strftime('%Y-%m-%d %H:%M')
-        display_df['exit_time'] = pd.to_datetime(display_df['exit_time']).dt.strftime('%Y-%m-%d %H:%M')
+        # Trade times come out of the backtester as datetime64, so only parse if needed
+        def as_times(col):
+            times = view[col]
+            if not pd.api.types.is_datetime64_any_dtype(times):
+                times = pd.to_datetime(times)
+            return times.dt.strftime('%Y-%m-%d %H:%M')
+
+        display_df = view.copy()
+        display_df['entry_time'] = as_times('entry_time')
+        display_df['exit_time'] = as_times('exit_time')
         display_df['entry_price'] = display_df['entry_price'].round(2)
         display_df['exit_price'] = display_df['exit_price'].round(2)
         display_df['return_pct'] = display_df['return_pct'].round(2)
         display_df['profit'] = display_df['profit'].round(2)
 
-        # Color code returns
-        def color_returns(val):
-            if isinstance(val, (int, float)):
-                color = 'green' if val > 0 else 'red'
-                return f'color: {color}'
-            return ''
-
-        styled_trades = display_df.style.map(
+        # Color code returns (one vectorized pass per column)
+        styled_trades = display_df.style.apply(
             color_returns,
             subset=['return_pct', 'profit']
         )
 
-        st.dataframe(styled_trades, width='stretch')
+        st.dataframe(styled_trades, width='stretch', height=TRADE_TABLE_HEIGHT)
+        if len(view) < len(trades_df):
+            st.caption(f"Showing the most recent {len(view)} of {len(trades_df)} trades - tick 'Show all trades' or download the CSV for the full history")
 
         # Summary by exit reason
         st.subheader("Exit Reason Analysis")
-        exit_summary = trades_df.groupby('exit_reason').agg({
-            'return_pct': ['count', 'mean', 'sum'],
-            'profit': 'sum'
-        }).round(2)
+        exit_summary = trades_df.groupby('exit_reason', observed=True, sort=False).agg(
+            trades=('return_pct', 'count'),
+            avg_return_pct=('return_pct', 'mean'),
+            total_return_pct=('return_pct', 'sum'),
+            total_profit=('profit', 'sum')
+        ).round(2)
         st.dataframe(exit_summary, width='stretch')
 
         # Download button
-        csv = trades_df.to_csv(index=False)
+        csv = trades_to_csv(trades_df)
         st.download_button(
             label="📥 Download Trade History as CSV",
             data=csv,
@@ -9,6 +9,21 @@ Tests simple strategies like:
 import pandas as pd
 import numpy as np
 from datetime import datetime
+import hashlib
+from sweep_utils import run_sweep
+
+try:
+    # Optional: bottleneck's nan-aware reductions are a single compiled pass
+    from bottleneck import nanstd
+except ImportError:
+    from numpy import nanstd
+
+
+def _run_sweep_params(backtester, params):
+    """Sweep worker: run one parameter combination and return flat metrics"""
+    backtester.run_strategy(**params)
+    metrics = backtester.metrics
+    return {**metrics['strategy'], **metrics['trades']}
 
 
 class Backtester:
@@ -32,11 +47,21 @@ class Backtester:
         # Align data
         self.data = self._align_data()
 
+        # Prices as a plain array, shared read-only by every run
+        # (contiguous even if the source column was a strided view, so the
+        # divide/cumprod kernels take their vectorized paths)
+        self._prices = np.ascontiguousarray(self.data['price'].to_numpy(), dtype=np.float64)
+
         # Results storage
         self.results = None
         self.trades = None
         self.metrics = None
 
+        # (trades, metrics) keyed by a hash of the position vector. Prices and
+        # capital are fixed per instance, so equal positions give equal
+        # results - common in sweeps where several stage lists coincide.
+        self._results_cache = {}
+
     def _align_data(self):
         """Align price data and cycle stages by date"""
         df = pd.DataFrame()
@@ -49,6 +74,9 @@ class Backtester:
         # Drop any rows with missing data
         df = df.dropna()
 
+        # Only four distinct stages - a categorical makes the stage masks cheap
+        df['cycle'] = df['cycle'].astype('category')
+
         return df
 
     def run_strategy(self, long_stages=['Expansion'], short_stages=None):
@@ -69,41 +97,82 @@ class Backtester:
         print(f"  Period: {self.data.index[0].date()} to {self.data.index[-1].date()}")
         print()
 
-        # Initialize portfolio
-        df = self.data.copy()
-        df['position'] = 0  # 0 = cash, 1 = long, -1 = short
+        # Set positions based on cycle stage in a single pass
+        # (0 = cash, 1 = long, -1 = short; short stages take precedence)
+        cycles = self.data['cycle']
+        position = np.select(
+            [cycles.isin(short_stages or []), cycles.isin(long_stages)],
+            [-1, 1],
+            default=0
+        ).astype(np.int8)
+
+        # Calculate returns on plain arrays: one pass for daily returns, one
+        # cumprod per equity curve. The first day has no market return (NaN),
+        # but both portfolios start at the initial capital.
+        prices = self._prices
+        market_return = np.empty_like(prices)
+        market_return[0] = np.nan
+        np.divide(prices[1:], prices[:-1], out=market_return[1:])
+        market_return[1:] -= 1
+
+        strategy_return = np.zeros_like(prices)
+        np.multiply(position[:-1], market_return[1:], out=strategy_return[1:])
+
+        growth = 1 + market_return
+        growth[0] = 1
 
-        # Set positions based on cycle stage
-        for stage in long_stages:
-            df.loc[df['cycle'] == stage, 'position'] = 1
-
-        if short_stages:
-            for stage in short_stages:
-                df.loc[df['cycle'] == stage, 'position'] = -1
+        # Track position changes (trades)
+        position_change = np.empty_like(prices)
+        position_change[0] = np.nan
+        np.subtract(position[1:], position[:-1], out=position_change[1:])
+
+        # Build the results frame once from the finished columns
+        df = pd.DataFrame({
+            'price': self.data['price'],
+            'cycle': self.data['cycle'],
+            'position': position,
+            'market_return': market_return,
+            'strategy_return': strategy_return,
+            'strategy_value': self.initial_capital * np.cumprod(1 + strategy_return),
+            'buyhold_value': self.initial_capital * np.cumprod(growth),
+            'position_change': position_change
+        }, index=self.data.index, copy=False)
 
-        # Calculate returns
-        df['market_return'] = df['price'].pct_change()
-        df['strategy_return'] = df['position'].shift(1) * df['market_return']
+        self.results = df
 
-        # Handle cash positions (assume 0% return for simplicity)
-        df['strategy_return'] = df['strategy_return'].fillna(0)
+        key = hashlib.blake2b(position.tobytes(), digest_size=16).digest()
+        cached = self._results_cache.get(key)
+        if cached is not None:
+            self.trades, self.metrics = cached
+        else:
+            self._extract_trades()
+            self._calculate_metrics()
+            self._results_cache[key] = (self.trades, self.metrics)
 
-        # Calculate cumulative portfolio value
-        df['strategy_value'] = self.initial_capital * (1 + df['strategy_return']).cumprod()
-        df['buyhold_value'] = self.initial_capital * (1 + df['market_return']).cumprod()
+        return df
 
-        # Fill initial NaN with starting capital
-        df['strategy_value'] = df['strategy_value'].fillna(self.initial_capital)
-        df['buyhold_value'] = df['buyhold_value'].fillna(self.initial_capital)
+    def sweep(self, param_grid, max_workers=None):
+        """
+        Run run_strategy over every combination of parameters in parallel
 
-        # Track position changes (trades)
-        df['position_change'] = df['position'].diff()
+        Args:
+            param_grid: Dict mapping run_strategy argument names to lists of
+                values, e.g. {'long_stages': [['Expansion'],
+                ['Expansion', 'Recovery']], 'short_stages': [None,
+                ['Contraction']]}
+            max_workers: Number of worker processes (None = one per CPU)
 
-        self.results = df
-        self._extract_trades()
-        self._calculate_metrics()
+        Returns:
+            DataFrame of strategy and trade metrics, one row per parameter
+            combination, indexed by the parameter values
+        """
+        # Ship only the already-aligned close prices and categorical stages,
+        # not the full OHLCV frame and raw classifier output; re-aligning
+        # them in the worker is a no-op
+        initargs = (self.data['price'].to_frame('Close'), self.data['cycle'],
+                    self.initial_capital)
 
-        return df
+        return run_sweep(param_grid, Backtester, initargs, _run_sweep_params, max_workers)
 
     def _extract_trades(self):
         """Extract trade entry and exit points"""
@@ -111,37 +180,33 @@ class Backtester:
             return
 
         df = self.results
-        trades = []
-
-        # Find entries (position change from 0 to 1)
-        entries = df[df['position_change'] == 1].copy()
-
-        # Find exits (position change from 1 to 0)
-        exits = df[df['position_change'] == -1].copy()
-
-        # Match entries with exits
-        for i, entry in entries.iterrows():
-            # Find next exit after this entry
-            future_exits = exits[exits.index > i]
-
-            if len(future_exits) > 0:
-                exit_date = future_exits.index[0]
-                exit_row = df.loc[exit_date]
-
-                entry_price = entry['price']
-                exit_price = exit_row['price']
-                pnl = (exit_price - entry_price) / entry_price * 100
-
-                trades.append({
-                    'entry_date': i,
-                    'exit_date': exit_date,
-                    'entry_price': entry_price,
-                    'exit_price': exit_price,
-                    'return_pct': pnl,
-                    'days_held': (exit_date - i).days
-                })
-
-        self.trades = pd.DataFrame(trades)
+        position_change = df['position_change'].to_numpy()
+
+        # Find entries (position change from 0 to 1) and exits (1 to 0)
+        entry_idx = np.flatnonzero(position_change == 1)
+        exit_idx = np.flatnonzero(position_change == -1)
+
+        # Match each entry with the next exit after it; entries still open
+        # at the end of the data have no exit and are dropped
+        next_exit = np.searchsorted(exit_idx, entry_idx, side='right')
+        has_exit = next_exit < len(exit_idx)
+        entry_idx = entry_idx[has_exit]
+        exit_idx = exit_idx[next_exit[has_exit]]
+
+        prices = self._prices
+        entry_price = prices[entry_idx]
+        exit_price = prices[exit_idx]
+        entry_date = df.index[entry_idx]
+        exit_date = df.index[exit_idx]
+
+        self.trades = pd.DataFrame({
+            'entry_date': entry_date,
+            'exit_date': exit_date,
+            'entry_price': entry_price,
+            'exit_price': exit_price,
+            'return_pct': (exit_price - entry_price) / entry_price * 100,
+            'days_held': (exit_date - entry_date).days
+        })
 
     def _calculate_metrics(self):
         """Calculate performance metrics"""
@@ -160,23 +225,25 @@ class Backtester:
         buyhold_annual_return = ((df['buyhold_value'].iloc[-1] / self.initial_capital) ** (1/years) - 1) * 100
 
         # Volatility (annualized)
-        strategy_volatility = df['strategy_return'].std() * np.sqrt(252) * 100
-        buyhold_volatility = df['market_return'].std() * np.sqrt(252) * 100
+        strategy_volatility = nanstd(df['strategy_return'].to_numpy(), ddof=1) * np.sqrt(252) * 100
+        buyhold_volatility = nanstd(df['market_return'].to_numpy(), ddof=1) * np.sqrt(252) * 100
 
         # Sharpe ratio (assuming 0% risk-free rate)
         strategy_sharpe = strategy_annual_return / strategy_volatility if strategy_volatility > 0 else 0
         buyhold_sharpe = buyhold_annual_return / buyhold_volatility if buyhold_volatility > 0 else 0
 
         # Maximum drawdown
-        strategy_dd = self._calculate_max_drawdown(df['strategy_value'])
-        buyhold_dd = self._calculate_max_drawdown(df['buyhold_value'])
+        strategy_dd, buyhold_dd = self._calculate_max_drawdowns(
+            df['strategy_value'], df['buyhold_value'])
 
         # Win rate
         if self.trades is not None and len(self.trades) > 0:
-            winning_trades = len(self.trades[self.trades['return_pct'] > 0])
-            win_rate = (winning_trades / len(self.trades)) * 100
-            avg_win = self.trades[self.trades['return_pct'] > 0]['return_pct'].mean()
-            avg_loss = self.trades[self.trades['return_pct'] < 0]['return_pct'].mean()
+            returns = self.trades['return_pct'].to_numpy()
+            wins = returns[returns > 0]
+            losses = returns[returns < 0]
+            win_rate = wins.size / returns.size * 100
+            avg_win = wins.mean() if wins.size else 0
+            avg_loss = losses.mean() if losses.size else 0
         else:
             win_rate = 0
             avg_win = 0
@@ -202,16 +269,25 @@ class Backtester:
             'trades': {
                 'total_trades': len(self.trades) if self.trades is not None else 0,
                 'win_rate': win_rate,
-                'avg_win': avg_win if not np.isnan(avg_win) else 0,
-                'avg_loss': avg_loss if not np.isnan(avg_loss) else 0,
+                'avg_win': avg_win,
+                'avg_loss': avg_loss,
             }
         }
 
-    def _calculate_max_drawdown(self, equity_curve):
-        """Calculate maximum drawdown from equity curve"""
-        running_max = equity_curve.expanding().max()
-        drawdown = (equity_curve - running_max) / running_max * 100
-        return drawdown.min()
+    def _calculate_max_drawdowns(self, *equity_curves):
+        """
+        Calculate maximum drawdown for several equity curves in one pass
+
+        The curves share an index, so they are stacked into one 2-D array
+        and every step below is a single NumPy call across all of them.
+
+        Returns:
+            Tuple of max drawdowns (in %), one per curve
+        """
+        values = np.vstack([np.asarray(curve, dtype=np.float64) for curve in equity_curves])
+        running_max = np.maximum.accumulate(values, axis=1)
+        drawdown = (values - running_max) / running_max * 100
+        return tuple(drawdown.min(axis=1).tolist())
 
     def print_summary(self):
         """Print backtest summary"""
@@ -11,6 +11,110 @@ Improvements over basic backtester:
 import pandas as pd
 import numpy as np
 from datetime import datetime
+from sweep_utils import run_sweep
+
+try:
+    # Optional: bottleneck's nan-aware reductions are a single compiled pass
+    from bottleneck import nanstd
+except ImportError:
+    from numpy import nanstd
+
+
+def _run_trailing_stop(prices, cycle_codes, cycle_names, stay_in_peak,
+                       peak_stop_loss, expansion_stop_loss, include_recovery):
+    """
+    Sequential position/trailing-stop state machine behind run_enhanced_strategy
+
+    Works on NumPy arrays with scalar locals only (no pandas lookups per day),
+    since each day's stop depends on the peak carried over from earlier days.
+
+    Args:
+        prices: float64 array of daily prices
+        cycle_codes: integer categorical codes of the cycle stage per day
+        cycle_names: stage names indexed by those codes
+        stay_in_peak, peak_stop_loss, expansion_stop_loss, include_recovery:
+            see BacktesterEnhanced.run_enhanced_strategy
+
+    Returns:
+        Tuple of arrays (position, entry_price, peak_since_entry,
+        stop_loss_level, stop_loss_hit). Positions are int8 and the
+        price-level diagnostics float32; the stop checks themselves run on
+        the float64 prices.
+    """
+    # Resolve whether to be long, and with which stop, once per stage rather
+    # than once per day; the loop then only reads the per-day lookups
+    long_by_code = np.zeros(len(cycle_names), dtype=bool)
+    stop_by_code = np.full(len(cycle_names), expansion_stop_loss)
+    for code, cycle in enumerate(cycle_names):
+        if cycle == 'Expansion':
+            long_by_code[code] = True
+        elif cycle == 'Peak' and stay_in_peak:
+            long_by_code[code] = True
+            stop_by_code[code] = peak_stop_loss
+        elif cycle == 'Recovery' and include_recovery:
+            long_by_code[code] = True
+
+    n = len(prices)
+    position = np.zeros(n, dtype=np.int8)
+    entry_prices = np.full(n, np.nan, dtype=np.float32)
+    peaks = np.full(n, np.nan, dtype=np.float32)
+    stop_levels = np.full(n, np.nan, dtype=np.float32)
+    stop_hits = np.zeros(n, dtype=bool)
+
+    # Track state
+    current_position = 0
+    entry_price = None
+    peak_since_entry = None
+
+    days = zip(prices.tolist(),
+               long_by_code[cycle_codes].tolist(),
+               stop_by_code[cycle_codes].tolist())
+
+    for i, (price, should_be_long, current_stop_pct) in enumerate(days):
+        # Check stop-loss if we're currently long
+        stop_loss_triggered = False
+        if current_position == 1 and entry_price is not None and peak_since_entry is not None:
+            # Update peak
+            if price > peak_since_entry:
+                peak_since_entry = price
+
+            # Check trailing stop from peak
+            stop_loss_level = peak_since_entry * (1 - current_stop_pct)
+            stop_levels[i] = stop_loss_level
+
+            if price <= stop_loss_level:
+                stop_loss_triggered = True
+                stop_hits[i] = True
+
+        # Position logic
+        if current_position == 0:
+            # Not in position - check if we should enter
+            if should_be_long and not stop_loss_triggered:
+                current_position = 1
+                entry_price = price
+                peak_since_entry = price
+                entry_prices[i] = entry_price
+        else:
+            # In position - check if we should exit
+            if not should_be_long or stop_loss_triggered:
+                current_position = 0
+                entry_price = None
+                peak_since_entry = None
+            else:
+                # Stay in position
+                entry_prices[i] = entry_price
+                peaks[i] = peak_since_entry
+
+        position[i] = current_position
+
+    return position, entry_prices, peaks, stop_levels, stop_hits
+
+
+def _run_sweep_params(backtester, params):
+    """Sweep worker: run one parameter combination and return flat metrics"""
+    backtester.run_enhanced_strategy(**params)
+    metrics = backtester.metrics
+    return {**metrics['strategy'], **metrics['trades']}
 
 
 class BacktesterEnhanced:
@@ -34,6 +138,13 @@ class BacktesterEnhanced:
         # Align data
         self.data = self._align_data()
 
+        # Prices and stages as plain arrays, shared read-only by every run
+        # (contiguous even if the source column was a strided view, so the
+        # divide/cumprod kernels take their vectorized paths)
+        self._prices = np.ascontiguousarray(self.data['price'].to_numpy(), dtype=np.float64)
+        self._cycles = self.data['cycle'].to_numpy()
+        self._cycle_codes = self.data['cycle'].cat.codes.to_numpy()
+
         # Results storage
         self.results = None
         self.trades = None
@@ -51,6 +162,9 @@ class BacktesterEnhanced:
         # Drop any rows with missing data
         df = df.dropna()
 
+        # Only four distinct stages - store them as a categorical
+        df['cycle'] = df['cycle'].astype('category')
+
         return df
 
     def run_enhanced_strategy(self,
@@ -87,91 +201,48 @@ class BacktesterEnhanced:
         print(f"  Period: {self.data.index[0].date()} to {self.data.index[-1].date()}")
         print()
 
-        # Initialize
-        df = self.data.copy()
-        df['position'] = 0.0
-        df['entry_price'] = np.nan
-        df['peak_since_entry'] = np.nan
-        df['stop_loss_level'] = np.nan
-        df['stop_loss_hit'] = False
-
-        # Track state
-        current_position = 0
-        entry_price = None
-        peak_since_entry = None
-
-        for i in range(len(df)):
-            idx = df.index[i]
-            cycle = df.loc[idx, 'cycle']
-            price = df.loc[idx, 'price']
-
-            # Determine if we should be long based on cycle
-            should_be_long = False
-            current_stop_pct = expansion_stop_loss
-
-            if cycle == 'Expansion':
-                should_be_long = True
-                current_stop_pct = expansion_stop_loss
-            elif cycle == 'Peak' and stay_in_peak:
-                should_be_long = True
-                current_stop_pct = peak_stop_loss
-            elif cycle == 'Recovery' and include_recovery:
-                should_be_long = True
-                current_stop_pct = expansion_stop_loss
-            elif cycle == 'Contraction':
-                should_be_long = False
-
-            # Check stop-loss if we're currently long
-            stop_loss_triggered = False
-            if current_position == 1 and entry_price is not None and peak_since_entry is not None:
-                # Update peak
-                if price > peak_since_entry:
-                    peak_since_entry = price
-
-                # Check trailing stop from peak
-                stop_loss_level = peak_since_entry * (1 - current_stop_pct)
-                df.loc[idx, 'stop_loss_level'] = stop_loss_level
-
-                if price <= stop_loss_level:
-                    stop_loss_triggered = True
-                    df.loc[idx, 'stop_loss_hit'] = True
-
-            # Position logic
-            if current_position == 0:
-                # Not in position - check if we should enter
-                if should_be_long and not stop_loss_triggered:
-                    current_position = 1
-                    entry_price = price
-                    peak_since_entry = price
-                    df.loc[idx, 'entry_price'] = entry_price
-            else:
-                # In position - check if we should exit
-                if not should_be_long or stop_loss_triggered:
-                    current_position = 0
-                    entry_price = None
-                    peak_since_entry = None
-                else:
-                    # Stay in position
-                    df.loc[idx, 'entry_price'] = entry_price
-                    df.loc[idx, 'peak_since_entry'] = peak_since_entry
-
-            df.loc[idx, 'position'] = current_position
-
-        # Calculate returns
-        df['market_return'] = df['price'].pct_change()
-        df['strategy_return'] = df['position'].shift(1) * df['market_return']
-        df['strategy_return'] = df['strategy_return'].fillna(0)
-
-        # Calculate cumulative portfolio value
-        df['strategy_value'] = self.initial_capital * (1 + df['strategy_return']).cumprod()
-        df['buyhold_value'] = self.initial_capital * (1 + df['market_return']).cumprod()
-
-        # Fill initial NaN
-        df['strategy_value'] = df['strategy_value'].fillna(self.initial_capital)
-        df['buyhold_value'] = df['buyhold_value'].fillna(self.initial_capital)
+        # Run the day-by-day state machine on plain arrays
+        (position, entry_price, peak_since_entry,
+         stop_loss_level, stop_loss_hit) = _run_trailing_stop(
+            self._prices, self._cycle_codes, self.data['cycle'].cat.categories,
+            stay_in_peak, peak_stop_loss, expansion_stop_loss, include_recovery
+        )
+
+        # Calculate returns on plain arrays: one pass for daily returns, one
+        # cumprod per equity curve. The first day has no market return (NaN),
+        # but both portfolios start at the initial capital.
+        prices = self._prices
+        market_return = np.empty_like(prices)
+        market_return[0] = np.nan
+        np.divide(prices[1:], prices[:-1], out=market_return[1:])
+        market_return[1:] -= 1
+
+        strategy_return = np.zeros_like(prices)
+        np.multiply(position[:-1], market_return[1:], out=strategy_return[1:])
+
+        growth = 1 + market_return
+        growth[0] = 1
 
         # Track position changes
-        df['position_change'] = df['position'].diff()
+        position_change = np.empty_like(prices)
+        position_change[0] = np.nan
+        np.subtract(position[1:], position[:-1], out=position_change[1:])
+
+        # Build the results frame once from the finished columns
+        df = pd.DataFrame({
+            'price': self.data['price'],
+            'cycle': self.data['cycle'],
+            'position': position,
+            'entry_price': entry_price,
+            'peak_since_entry': peak_since_entry,
+            'stop_loss_level': stop_loss_level,
+            'stop_loss_hit': stop_loss_hit,
+            'market_return': market_return,
+            'strategy_return': strategy_return,
+            'strategy_value': self.initial_capital * np.cumprod(1 + strategy_return),
+            'buyhold_value': self.initial_capital * np.cumprod(growth),
+            'position_change': position_change
+        }, index=self.data.index, copy=False)
 
         self.results = df
         self._extract_trades()
@@ -184,49 +255,68 @@ class BacktesterEnhanced:
 
         return df
 
+    def sweep(self, param_grid, max_workers=None):
+        """
+        Run run_enhanced_strategy over every combination of parameters in parallel
+
+        Args:
+            param_grid: Dict mapping run_enhanced_strategy argument names to
+                lists of values, e.g. {'peak_stop_loss': [0.10, 0.15],
+                'expansion_stop_loss': [0.15, 0.20, 0.25]}
+            max_workers: Number of worker processes (None = one per CPU)
+
+        Returns:
+            DataFrame of strategy and trade metrics, one row per parameter
+            combination, indexed by the parameter values
+        """
+        # Ship only the already-aligned close prices and categorical stages,
+        # not the full OHLCV frame and raw classifier output; re-aligning
+        # them in the worker is a no-op
+        initargs = (self.data['price'].to_frame('Close'), self.data['cycle'],
+                    self.initial_capital)
+
+        return run_sweep(param_grid, BacktesterEnhanced, initargs, _run_sweep_params, max_workers)
+
     def _extract_trades(self):
         """Extract trade entry and exit points"""
         if self.results is None:
             return
 
         df = self.results
-        trades = []
-
-        # Find entries (position change from 0 to 1)
-        entries = df[df['position_change'] == 1].copy()
-
-        # Find exits (position change from 1 to 0)
-        exits = df[df['position_change'] == -1].copy()
-
-        # Match entries with exits
-        for i, entry in entries.iterrows():
-            # Find next exit after this entry
-            future_exits = exits[exits.index > i]
-
-            if len(future_exits) > 0:
-                exit_date = future_exits.index[0]
-                exit_row = df.loc[exit_date]
-
-                entry_price = entry['price']
-                exit_price = exit_row['price']
-                pnl = (exit_price - entry_price) / entry_price * 100
-
-                # Check if exit was due to stop-loss
-                exit_reason = 'Stop-loss' if exit_row['stop_loss_hit'] else 'Cycle change'
-
-                trades.append({
-                    'entry_date': i,
-                    'exit_date': exit_date,
-                    'entry_price': entry_price,
-                    'exit_price': exit_price,
-                    'return_pct': pnl,
-                    'days_held': (exit_date - i).days,
-                    'exit_reason': exit_reason,
-                    'entry_cycle': entry['cycle'],
-                    'exit_cycle': exit_row['cycle']
-                })
-
-        self.trades = pd.DataFrame(trades)
+        position_change = df['position_change'].to_numpy()
+
+        # Find entries (position change from 0 to 1) and exits (1 to 0)
+        entry_idx = np.flatnonzero(position_change == 1)
+        exit_idx = np.flatnonzero(position_change == -1)
+
+        # Match each entry with the next exit after it; entries still open
+        # at the end of the data have no exit and are dropped
+        next_exit = np.searchsorted(exit_idx, entry_idx, side='right')
+        has_exit = next_exit < len(exit_idx)
+        entry_idx = entry_idx[has_exit]
+        exit_idx = exit_idx[next_exit[has_exit]]
+
+        prices = self._prices
+        entry_price = prices[entry_idx]
+        exit_price = prices[exit_idx]
+        entry_date = df.index[entry_idx]
+        exit_date = df.index[exit_idx]
+
+        stop_loss_hit = df['stop_loss_hit'].to_numpy()
+        cycles = self._cycles
+
+        self.trades = pd.DataFrame({
+            'entry_date': entry_date,
+            'exit_date': exit_date,
+            'entry_price': entry_price,
+            'exit_price': exit_price,
+            'return_pct': (exit_price - entry_price) / entry_price * 100,
+            'days_held': (exit_date - entry_date).days,
+            # Check if exit was due to stop-loss
+            'exit_reason': np.where(stop_loss_hit[exit_idx], 'Stop-loss', 'Cycle change'),
+            'entry_cycle': cycles[entry_idx],
+            'exit_cycle': cycles[exit_idx]
+        })
 
     def _calculate_metrics(self):
         """Calculate performance metrics"""
@@ -245,27 +335,29 @@ class BacktesterEnhanced:
         buyhold_annual_return = ((df['buyhold_value'].iloc[-1] / self.initial_capital) ** (1/years) - 1) * 100
 
         # Volatility (annualized)
-        strategy_volatility = df['strategy_return'].std() * np.sqrt(252) * 100
-        buyhold_volatility = df['market_return'].std() * np.sqrt(252) * 100
+        strategy_volatility = nanstd(df['strategy_return'].to_numpy(), ddof=1) * np.sqrt(252) * 100
+        buyhold_volatility = nanstd(df['market_return'].to_numpy(), ddof=1) * np.sqrt(252) * 100
 
         # Sharpe ratio (assuming 0% risk-free rate)
         strategy_sharpe = strategy_annual_return / strategy_volatility if strategy_volatility > 0 else 0
         buyhold_sharpe = buyhold_annual_return / buyhold_volatility if buyhold_volatility > 0 else 0
 
         # Maximum drawdown
-        strategy_dd = self._calculate_max_drawdown(df['strategy_value'])
-        buyhold_dd = self._calculate_max_drawdown(df['buyhold_value'])
+        strategy_dd, buyhold_dd = self._calculate_max_drawdowns(
+            df['strategy_value'], df['buyhold_value'])
 
         # Win rate and trade stats
         if self.trades is not None and len(self.trades) > 0:
-            winning_trades = len(self.trades[self.trades['return_pct'] > 0])
-            win_rate = (winning_trades / len(self.trades)) * 100
-            avg_win = self.trades[self.trades['return_pct'] > 0]['return_pct'].mean()
-            avg_loss = self.trades[self.trades['return_pct'] < 0]['return_pct'].mean()
+            returns = self.trades['return_pct'].to_numpy()
+            wins = returns[returns > 0]
+            losses = returns[returns < 0]
+            win_rate = wins.size / returns.size * 100
+            avg_win = wins.mean() if wins.size else 0
+            avg_loss = losses.mean() if losses.size else 0
 
             # Stop-loss exits
-            stop_loss_exits = len(self.trades[self.trades['exit_reason'] == 'Stop-loss'])
-            stop_loss_pct = (stop_loss_exits / len(self.trades)) * 100 if len(self.trades) > 0 else 0
+            stop_loss_exits = np.count_nonzero(self.trades['exit_reason'].to_numpy() == 'Stop-loss')
+            stop_loss_pct = stop_loss_exits / returns.size * 100
         else:
             win_rate = 0
             avg_win = 0
@@ -293,18 +385,27 @@ class BacktesterEnhanced:
             'trades': {
                 'total_trades': len(self.trades) if self.trades is not None else 0,
                 'win_rate': win_rate,
-                'avg_win': avg_win if not np.isnan(avg_win) else 0,
-                'avg_loss': avg_loss if not np.isnan(avg_loss) else 0,
+                'avg_win': avg_win,
+                'avg_loss': avg_loss,
                 'stop_loss_exits': stop_loss_exits,
                 'stop_loss_exit_pct': stop_loss_pct,
             }
         }
 
-    def _calculate_max_drawdown(self, equity_curve):
-        """Calculate maximum drawdown from equity curve"""
-        running_max = equity_curve.expanding().max()
-        drawdown = (equity_curve - running_max) / running_max * 100
-        return drawdown.min()
+    def _calculate_max_drawdowns(self, *equity_curves):
+        """
+        Calculate maximum drawdown for several equity curves in one pass
+
+        The curves share an index, so they are stacked into one 2-D array
+        and every step below is a single NumPy call across all of them.
+
+        Returns:
+            Tuple of max drawdowns (in %), one per curve
+        """
+        values = np.vstack([np.asarray(curve, dtype=np.float64) for curve in equity_curves])
+        running_max = np.maximum.accumulate(values, axis=1)
+        drawdown = (values - running_max) / running_max * 100
+        return tuple(drawdown.min(axis=1).tolist())
 
     def print_summary(self):
         """Print backtest summary"""
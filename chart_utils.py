@@ -0,0 +1,112 @@
+"""
+Chart helpers: drawdown curves and thinning long series before they are plotted
+
+Shared by the Streamlit app and the matplotlib report scripts.
+"""
+
+import pandas as pd
+import numpy as np
+
+
+# Maximum number of points kept per plotted line
+MAX_CHART_POINTS = 2000
+
+
+def drawdown(values):
+    """
+    Percent drawdown of an equity curve from its running peak
+
+    Args:
+        values: Equity values (array or Series)
+
+    Returns:
+        float64 array of drawdowns in percent (0 at new highs)
+    """
+    values = np.ascontiguousarray(values, dtype=np.float64)
+    # One buffer: running peak, then overwritten in place with the drawdown
+    result = np.maximum.accumulate(values)
+    np.divide(values, result, out=result)
+    result -= 1.0
+    result *= 100.0
+    return result
+
+
+def downsample(series, max_points=MAX_CHART_POINTS):
+    """
+    Thin a long series before plotting while keeping its visual shape
+
+    Splits the series into buckets and keeps the min and max point of each,
+    so drawdown troughs and equity peaks survive the reduction.
+
+    Args:
+        series: Series to thin
+        max_points: Maximum number of points to keep
+
+    Returns:
+        Series with at most max_points rows (unchanged if already short)
+    """
+    n = len(series)
+    if n <= max_points:
+        return series
+
+    values = series.to_numpy(dtype=float)
+    n_buckets = max_points // 2
+    bucket_size = -(-n // n_buckets)  # ceil division
+
+    # Pad to a full grid so every bucket can be reduced in one vectorized pass
+    padded = np.full(n_buckets * bucket_size, np.nan)
+    padded[:n] = values
+    buckets = padded.reshape(n_buckets, bucket_size)
+
+    offsets = np.arange(n_buckets) * bucket_size
+    mins = offsets + np.argmin(np.where(np.isnan(buckets), np.inf, buckets), axis=1)
+    maxs = offsets + np.argmax(np.where(np.isnan(buckets), -np.inf, buckets), axis=1)
+
+    keep = np.unique(np.concatenate(([0, n - 1], mins, maxs)))
+    return series.iloc[keep[keep < n]]
+
+
+def lttb(series, max_points=MAX_CHART_POINTS):
+    """
+    Thin a long line series with Largest-Triangle-Three-Buckets
+
+    Keeps the first and last point and, from each bucket in between, the
+    point forming the largest triangle with the previously kept point and
+    the next bucket's average - which preserves the visual shape of smooth
+    curves like equity lines better than min/max thinning.
+
+    Args:
+        series: Series to thin (DatetimeIndex or positional x)
+        max_points: Maximum number of points to keep
+
+    Returns:
+        Series with at most max_points rows (unchanged if already short)
+    """
+    n = len(series)
+    if n <= max_points or max_points < 3:
+        return series
+
+    y = series.to_numpy(dtype=float)
+    index = series.index
+    x = index.asi8.astype(float) if isinstance(index, pd.DatetimeIndex) else np.arange(n, dtype=float)
+
+    # Interior points are split into max_points - 2 buckets
+    edges = np.linspace(1, n - 1, max_points - 1).astype(int)
+    keep = np.empty(max_points, dtype=int)
+    keep[0], keep[-1] = 0, n - 1
+
+    a = 0
+    for i in range(max_points - 2):
+        start, end = edges[i], edges[i + 1]
+        if i < max_points - 3:
+            avg_x = x[end:edges[i + 2]].mean()
+            avg_y = y[end:edges[i + 2]].mean()
+        else:
+            avg_x, avg_y = x[-1], y[-1]
+
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a])
+                      - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(np.nan_to_num(area, nan=-1.0)))
+        keep[i + 1] = a
+
+    return series.iloc[keep]
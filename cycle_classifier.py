@@ -21,6 +21,36 @@ class CycleStage(Enum):
     RECOVERY = "Recovery"
 
 
+# Stage names by classification code (the CycleStage order, also used as the
+# categories of the classifications Series); code -1 (unclassified) picks the
+# trailing None
+_STAGE_NAMES = [stage.value for stage in CycleStage]
+_STAGE_LOOKUP = np.array(_STAGE_NAMES + [None], dtype=object)
+_STAGE_CODES = {stage: code for code, stage in enumerate(_STAGE_NAMES)}
+
+
+def _rolling_mean_and_trend(series, window, min_periods, lag=None):
+    """
+    Smooth an indicator and, optionally, measure how the smoothed value moved
+
+    Args:
+        series: Indicator Series
+        window, min_periods: Rolling mean settings
+        lag: Periods to difference the mean over (None = no trend)
+
+    Returns:
+        Tuple of float64 arrays (mean, trend); trend is None without a lag
+    """
+    mean = series.rolling(window=window, min_periods=min_periods).mean().to_numpy(dtype=np.float64)
+    if lag is None:
+        return mean, None
+
+    # Same as Series.diff(lag), straight on the array
+    trend = np.full_like(mean, np.nan)
+    np.subtract(mean[lag:], mean[:-lag], out=trend[lag:])
+    return mean, trend
+
+
 class EconomicCycleClassifier:
     """
     Rule-based classifier for economic cycle stages
@@ -34,7 +64,22 @@ class EconomicCycleClassifier:
     """
 
     def __init__(self):
-        self.classifications = None
+        # Stages are kept as int8 codes into _STAGE_LOOKUP; the categorical
+        # Series is only built when someone asks for it
+        self._codes = None
+        self._index = None
+        self._classifications = None
+
+    @property
+    def classifications(self):
+        """Categorical Series of stage names per period (None before classify runs)"""
+        if self._classifications is None and self._codes is not None:
+            # The codes already index _STAGE_NAMES, so this wraps them as-is
+            self._classifications = pd.Series(
+                pd.Categorical.from_codes(self._codes, categories=_STAGE_NAMES),
+                index=self._index
+            )
+        return self._classifications
 
     def classify(self, data):
         """
@@ -44,102 +89,120 @@ class EconomicCycleClassifier:
             data: DataFrame with economic indicators
 
         Returns:
-            Series with cycle stage classifications
+            Categorical Series with cycle stage classifications (NaN where
+            no stage could be assigned)
         """
         print("Classifying economic cycle stages...")
 
-        # Create a copy to avoid modifying original
-        df = data.copy()
+        # Calculate moving averages and trends for smoothing. They are kept as
+        # plain arrays rather than added as columns to a copy of the data.
+        smoothed = {}
+        if 'GDP_GROWTH' in data.columns:
+            smoothed['GDP_GROWTH_MA'], smoothed['GDP_TREND'] = _rolling_mean_and_trend(
+                data['GDP_GROWTH'], window=90, min_periods=30, lag=90)
 
-        # Calculate moving averages and trends for smoothing
-        if 'GDP_GROWTH' in df.columns:
-            df['GDP_GROWTH_MA'] = df['GDP_GROWTH'].rolling(window=90, min_periods=30).mean()
-            df['GDP_TREND'] = df['GDP_GROWTH_MA'].diff(periods=90)
+        if 'UNEMPLOYMENT' in data.columns:
+            smoothed['UNEMPLOYMENT_MA'], smoothed['UNEMPLOYMENT_TREND'] = _rolling_mean_and_trend(
+                data['UNEMPLOYMENT'], window=90, min_periods=30, lag=90)
 
-        if 'UNEMPLOYMENT' in df.columns:
-            df['UNEMPLOYMENT_MA'] = df['UNEMPLOYMENT'].rolling(window=90, min_periods=30).mean()
-            df['UNEMPLOYMENT_TREND'] = df['UNEMPLOYMENT_MA'].diff(periods=90)
+        if 'INFLATION_RATE' in data.columns:
+            smoothed['INFLATION_MA'], _ = _rolling_mean_and_trend(
+                data['INFLATION_RATE'], window=90, min_periods=30)
 
-        if 'INFLATION_RATE' in df.columns:
-            df['INFLATION_MA'] = df['INFLATION_RATE'].rolling(window=90, min_periods=30).mean()
+        if 'YIELD_CURVE' in data.columns:
+            smoothed['YIELD_CURVE_MA'], _ = _rolling_mean_and_trend(
+                data['YIELD_CURVE'], window=30, min_periods=10)
 
-        if 'YIELD_CURVE' in df.columns:
-            df['YIELD_CURVE_MA'] = df['YIELD_CURVE'].rolling(window=30, min_periods=10).mean()
+        # Classify every period at once; code -1 (unclassified) maps to None
+        codes = self._classify_periods(data, smoothed)
 
-        # Initialize with neutral state
-        stages = pd.Series(index=df.index, dtype=object)
+        # Forward fill missing values: carry the position of the last
+        # classified period forward and gather its code
+        last_classified = np.where(codes != -1, np.arange(len(codes)), 0)
+        np.maximum.accumulate(last_classified, out=last_classified)
+        codes = codes[last_classified]
 
-        # Classification logic for each row
-        for idx in df.index:
-            stage = self._classify_single_period(df.loc[idx])
-            stages.loc[idx] = stage.value if stage else None
-
-        # Forward fill missing values
-        stages = stages.ffill()
-
-        self.classifications = stages
-        print(f"✓ Classified {len(stages)} periods")
+        self._codes = codes
+        self._index = data.index
+        self._classifications = None
+        print(f"✓ Classified {len(codes)} periods")
 
         # Print summary
-        if not stages.empty:
+        if len(codes) > 0:
             print("\nCycle Distribution:")
+            counts = np.bincount(codes[codes != -1], minlength=len(_STAGE_LOOKUP) - 1)
             for stage in CycleStage:
-                count = (stages == stage.value).sum()
-                pct = (count / len(stages)) * 100
+                count = counts[_STAGE_CODES[stage.value]]
+                pct = (count / len(codes)) * 100
                 print(f"  {stage.value}: {count} days ({pct:.1f}%)")
 
-        return stages
+        return self.classifications
 
-    def _classify_single_period(self, row):
+    def _classify_periods(self, data, smoothed):
         """
-        Classify a single time period based on indicator values
+        Classify every time period based on indicator values
 
-        Rules (simplified):
+        Rules (simplified), checked in order - the first match wins:
         1. CONTRACTION: Negative GDP growth OR rapidly rising unemployment
-        2. RECOVERY: GDP turning positive, unemployment still high but falling
-        3. EXPANSION: Positive GDP growth, falling/low unemployment, moderate inflation
-        4. PEAK: Growth slowing, inflation rising, inverted yield curve
+        2. PEAK: Growth slowing, inflation rising, inverted yield curve
+        3. RECOVERY: GDP turning positive, unemployment still high but falling
+        4. EXPANSION: Positive GDP growth, falling/low unemployment, moderate inflation
+
+        Comparisons against a missing (NaN) indicator are False, so a missing
+        value never satisfies a rule.
+
+        Args:
+            data: DataFrame with economic indicators
+            smoothed: Dict of smoothed indicator arrays computed by classify
+
+        Returns:
+            int8 array of indices into _STAGE_LOOKUP (-1 = unclassified)
         """
-        # Extract indicators with defaults if missing
-        gdp_growth = row.get('GDP_GROWTH_MA', np.nan)
-        gdp_trend = row.get('GDP_TREND', np.nan)
-        unemployment = row.get('UNEMPLOYMENT_MA', np.nan)
-        unemployment_trend = row.get('UNEMPLOYMENT_TREND', np.nan)
-        inflation = row.get('INFLATION_MA', np.nan)
-        yield_curve = row.get('YIELD_CURVE_MA', np.nan)
+        n = len(data)
+
+        def column(name):
+            # Indicators default to missing if they could not be computed
+            if name in smoothed:
+                return smoothed[name]
+            if name in data.columns:
+                return data[name].to_numpy(dtype=np.float64)
+            return np.full(n, np.nan)
+
+        gdp_growth = column('GDP_GROWTH_MA')
+        gdp_trend = column('GDP_TREND')
+        unemployment = column('UNEMPLOYMENT_MA')
+        unemployment_trend = column('UNEMPLOYMENT_TREND')
+        inflation = column('INFLATION_MA')
+        yield_curve = column('YIELD_CURVE_MA')
 
         # Skip if too many missing values
-        missing_count = sum([np.isnan(x) for x in [gdp_growth, unemployment, inflation]])
-        if missing_count > 1:
-            return None
+        missing_count = (np.isnan(gdp_growth).astype(np.int8)
+                         + np.isnan(unemployment) + np.isnan(inflation))
+        too_sparse = missing_count > 1
 
         # CONTRACTION: Negative growth or rapidly rising unemployment
-        if (not np.isnan(gdp_growth) and gdp_growth < 0) or \
-           (not np.isnan(unemployment_trend) and unemployment_trend > 0.3):
-            return CycleStage.CONTRACTION
+        contraction = (gdp_growth < 0) | (unemployment_trend > 0.3)
 
         # PEAK: Slowing growth, high inflation, inverted yield curve
-        if (not np.isnan(gdp_trend) and gdp_trend < -0.5) and \
-           (not np.isnan(inflation) and inflation > 3.5) or \
-           (not np.isnan(yield_curve) and yield_curve < -0.2):
-            return CycleStage.PEAK
+        peak = ((gdp_trend < -0.5) & (inflation > 3.5)) | (yield_curve < -0.2)
 
         # RECOVERY: Positive but low growth, high unemployment but falling
-        if (not np.isnan(gdp_growth) and 0 <= gdp_growth < 2) and \
-           (not np.isnan(unemployment) and unemployment > 6) and \
-           (not np.isnan(unemployment_trend) and unemployment_trend < -0.1):
-            return CycleStage.RECOVERY
-
-        # EXPANSION: Healthy growth, low/falling unemployment
-        if (not np.isnan(gdp_growth) and gdp_growth >= 0) and \
-           (not np.isnan(unemployment_trend) and unemployment_trend <= 0):
-            return CycleStage.EXPANSION
-
-        # Default to expansion if indicators are generally positive
-        if (not np.isnan(gdp_growth) and gdp_growth > 0):
-            return CycleStage.EXPANSION
-
-        return None
+        recovery = ((gdp_growth >= 0) & (gdp_growth < 2) &
+                    (unemployment > 6) & (unemployment_trend < -0.1))
+
+        # EXPANSION: Healthy growth, low/falling unemployment - or, failing
+        # that, default to expansion if growth is generally positive
+        expansion = ((gdp_growth >= 0) & (unemployment_trend <= 0)) | (gdp_growth > 0)
+
+        return np.select(
+            [too_sparse, contraction, peak, recovery, expansion],
+            [-1,
+             _STAGE_CODES[CycleStage.CONTRACTION.value],
+             _STAGE_CODES[CycleStage.PEAK.value],
+             _STAGE_CODES[CycleStage.RECOVERY.value],
+             _STAGE_CODES[CycleStage.EXPANSION.value]],
+            default=-1
+        ).astype(np.int8)
 
     def get_cycle_changes(self):
         """
@@ -148,17 +211,28 @@ class EconomicCycleClassifier:
         Returns:
             DataFrame with cycle transitions
         """
-        if self.classifications is None:
+        if self._codes is None:
             return None
 
-        changes = self.classifications != self.classifications.shift(1)
-        transitions = self.classifications[changes].to_frame('stage')
-        transitions['prev_stage'] = self.classifications.shift(1)[changes]
+        codes = self._codes
+
+        # A period starts a transition if its stage differs from the previous
+        # one; unclassified (None) periods never compare equal to anything
+        changes = np.empty(len(codes), dtype=bool)
+        changes[:1] = True
+        np.not_equal(codes[1:], codes[:-1], out=changes[1:])
+        changes |= codes == -1
+
+        positions = np.flatnonzero(changes)
+        prev_codes = np.where(positions > 0, codes[positions - 1], -1)
 
-        return transitions
+        return pd.DataFrame({
+            'stage': _STAGE_LOOKUP[codes[positions]],
+            'prev_stage': _STAGE_LOOKUP[prev_codes]
+        }, index=self._index[positions], dtype=object)
 
     def get_current_stage(self):
         """Get the most recent cycle stage"""
-        if self.classifications is None or self.classifications.empty:
+        if self._codes is None or len(self._codes) == 0:
             return None
-        return self.classifications.iloc[-1]
+        return _STAGE_LOOKUP[self._codes[-1]]
@@ -9,17 +9,31 @@ import yfinance as yf
 from datetime import datetime
 import os
 from config import FRED_API_KEY, INDICATORS, START_DATE, END_DATE
+from disk_cache import CACHE_DIR, read_frame, write_frame
+
+
+# Downloaded FRED series are kept on disk (one parquet file per series and
+# start date) and reused until they are a day old
+FRED_CACHE_DIR = os.path.join(CACHE_DIR, 'fred')
+FRED_CACHE_MAX_AGE = 24 * 60 * 60  # seconds
+
+# Yahoo Finance price history is cached the same way (one file per ticker and
+# date range), so repeated backtest runs skip the download
+MARKET_CACHE_DIR = os.path.join(CACHE_DIR, 'market')
+MARKET_CACHE_MAX_AGE = 24 * 60 * 60  # seconds
 
 
 class EconomicDataFetcher:
     """Fetches and processes macroeconomic data from FRED"""
 
-    def __init__(self, api_key=None):
+    def __init__(self, api_key=None, cache_dir=FRED_CACHE_DIR, market_cache_dir=MARKET_CACHE_DIR):
         """
         Initialize the data fetcher
 
         Args:
             api_key: FRED API key (if None, tries to get from environment or config)
+            cache_dir: Directory for cached FRED series (None = no disk cache)
+            market_cache_dir: Directory for cached market data (None = no disk cache)
         """
         if api_key is None:
             api_key = os.environ.get('FRED_API_KEY', FRED_API_KEY)
@@ -31,8 +45,24 @@ class EconomicDataFetcher:
             )
 
         self.fred = Fred(api_key=api_key)
+        self.cache_dir = cache_dir
+        self.market_cache_dir = market_cache_dir
         self.data = None
 
+    def _get_series(self, series_id, start_date):
+        """Fetch one FRED series, reading/writing the disk cache when enabled"""
+        if self.cache_dir is None:
+            return self.fred.get_series(series_id, observation_start=start_date)
+
+        path = os.path.join(self.cache_dir, f"{series_id}_{start_date}.parquet")
+        cached = read_frame(path, max_age=FRED_CACHE_MAX_AGE)
+        if cached is not None:
+            return cached[series_id]
+
+        series = self.fred.get_series(series_id, observation_start=start_date)
+        write_frame(series.to_frame(series_id), path, max_age=FRED_CACHE_MAX_AGE)
+        return series
+
     def fetch_all_indicators(self, start_date=START_DATE, end_date=END_DATE):
         """
         Fetch all economic indicators from FRED
@@ -54,7 +84,7 @@ class EconomicDataFetcher:
 
             try:
                 print(f"  Fetching {name} ({series_id})...")
-                series = self.fred.get_series(series_id, observation_start=start_date)
+                series = self._get_series(series_id, start_date)
                 data_dict[name] = series
             except Exception as e:
                 print(f"  Warning: Could not fetch {name}: {e}")
@@ -78,8 +108,10 @@ class EconomicDataFetcher:
         if 'UNEMPLOYMENT' in df.columns:
             df['UNEMPLOYMENT_CHANGE'] = df['UNEMPLOYMENT'].diff()
 
-        # Forward fill to handle different data frequencies
-        df = df.resample('D').ffill()
+        # Forward fill to handle different data frequencies. asfreq with a
+        # fill method reindexes straight to daily dates (no resample groupby)
+        # and, like resample().ffill(), only fills the newly added days
+        df = df.asfreq('D', method='ffill')
 
         self.data = df
         print(f"✓ Fetched data from {df.index[0].date()} to {df.index[-1].date()}")
@@ -100,10 +132,22 @@ class EconomicDataFetcher:
         """
         print(f"Fetching {ticker} data from Yahoo Finance...")
 
+        path = None
+        if self.market_cache_dir is not None:
+            path = os.path.join(self.market_cache_dir, f"{ticker}_{start_date}_{end_date}.parquet")
+            data = read_frame(path, max_age=MARKET_CACHE_MAX_AGE)
+            if data is not None:
+                print(f"✓ Loaded cached {ticker} data from {data.index[0].date()} to {data.index[-1].date()}")
+                return data
+
         try:
             data = yf.download(ticker, start=start_date, end=end_date, progress=False, auto_adjust=False)
             print(f"✓ Fetched {ticker} data from {data.index[0].date()} to {data.index[-1].date()}")
-            return data
         except Exception as e:
             print(f"Error fetching {ticker}: {e}")
             return None
+
+        if path is not None:
+            write_frame(data, path, max_age=MARKET_CACHE_MAX_AGE)
+
+        return data
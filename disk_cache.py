@@ -0,0 +1,100 @@
+"""
+Best-effort parquet cache on disk
+
+Shared by the data fetchers, the Streamlit app and the swing backtester. A
+cache file that is missing, too old or unreadable is simply a miss, and a
+failed write only prints a warning (e.g. read-only deployments).
+"""
+
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+
+# Root of every on-disk cache (gitignored)
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache')
+
+
+def read_frame(path, max_age=None):
+    """
+    Read a cached DataFrame
+
+    Args:
+        path: Parquet file path
+        max_age: Maximum file age in seconds (None = never expires)
+
+    Returns:
+        DataFrame, or None on a cache miss
+    """
+    try:
+        if max_age is not None and time.time() - os.path.getmtime(path) >= max_age:
+            return None
+        return pd.read_parquet(path)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        # A truncated or otherwise unreadable file is treated as a miss; the
+        # next write replaces it
+        print(f"Warning: Ignoring unreadable cache file {path}: {e}")
+        return None
+
+
+def write_frame(df, path, max_age=None, **parquet_kwargs):
+    """
+    Write a DataFrame to the cache
+
+    The file is written under a temporary name and moved into place, so
+    readers never see a partial file.
+
+    Args:
+        df: DataFrame to cache
+        path: Parquet file path
+        max_age: If set, also delete files in the same directory older than
+            this many seconds (cache keys that include a date or start date
+            would otherwise pile up)
+        **parquet_kwargs: Passed to DataFrame.to_parquet (e.g. compression)
+    """
+    directory = os.path.dirname(path)
+    try:
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        os.close(fd)
+        try:
+            df.to_parquet(tmp_path, **parquet_kwargs)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+    except Exception as e:
+        print(f"Warning: Could not write cache file {path}: {e}")
+        return
+
+    if max_age is not None:
+        prune(directory, max_age)
+
+
+def prune(directory, max_age):
+    """
+    Delete cache files (and leftover temporary files) older than max_age
+
+    Args:
+        directory: Cache directory
+        max_age: Maximum file age in seconds
+    """
+    cutoff = time.time() - max_age
+    try:
+        entries = list(os.scandir(directory))
+    except OSError:
+        return
+
+    for entry in entries:
+        if not entry.name.endswith(('.parquet', '.tmp')):
+            continue
+        try:
+            if entry.is_file() and entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+        except OSError:
+            # Already removed by another process, or not ours to delete
+            pass
@@ -11,6 +11,7 @@ from data_fetcher import EconomicDataFetcher
 from cycle_classifier import EconomicCycleClassifier, CycleStage
 import matplotlib.pyplot as plt
 import pandas as pd
+import numpy as np
 
 
 def main():
@@ -85,14 +86,16 @@ def plot_cycles(data, stages, spy_data=None):
 
     fig, axes = plt.subplots(5, 1, figsize=(14, 14), sharex=True)
 
-    # Convert stages to numeric for plotting
-    stage_mapping = {
-        CycleStage.CONTRACTION.value: 0,
-        CycleStage.RECOVERY.value: 1,
-        CycleStage.EXPANSION.value: 2,
-        CycleStage.PEAK.value: 3,
-    }
-    stages_numeric = stages.map(stage_mapping)
+    # Convert stages to numeric for plotting - the categorical's codes give
+    # the position in this order; unclassified periods stay as gaps (NaN)
+    stage_order = [
+        CycleStage.CONTRACTION.value,
+        CycleStage.RECOVERY.value,
+        CycleStage.EXPANSION.value,
+        CycleStage.PEAK.value,
+    ]
+    codes = pd.Categorical(stages, categories=stage_order).codes
+    stages_numeric = np.where(codes >= 0, codes, np.nan)
 
     # Plot 1: S&P 500 (SPY) Price
     ax = axes[0]
@@ -6,11 +6,24 @@ Fetches 30-minute bars for swing trading
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
+from dateutil import tz
 from polygon import RESTClient
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
 import time
 import config
 
 
+# Minimum spacing between the start of two symbol downloads, to stay under
+# Polygon's request quota when fetching several symbols concurrently
+SYMBOL_REQUEST_INTERVAL = 1.0
+
+# Bar fields kept from each Polygon aggregate, and the starting size of the
+# buffers they are collected into (about three months of 30-minute bars)
+BAR_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+INITIAL_BAR_CAPACITY = 4096
+
+
 class IntradayDataFetcher:
     """Fetches intraday data from Polygon.io"""
 
@@ -24,6 +37,10 @@ class IntradayDataFetcher:
         self.api_key = api_key or config.POLYGON_API_KEY
         self.client = RESTClient(self.api_key)
 
+        # Shared by fetch_multiple_symbols workers to space out request starts
+        self._throttle_lock = threading.Lock()
+        self._next_request_time = 0.0
+
     def fetch_30min_bars(self, symbol, days_back=90):
         """
         Fetch 30-minute bars for a symbol
@@ -40,8 +57,13 @@ class IntradayDataFetcher:
 
         print(f"Fetching {symbol} 30-minute bars from {start_date.date()} to {end_date.date()}...")
 
-        # Collect all bars
-        bars = []
+        # Collect all bars column by column into NumPy buffers, doubling
+        # their capacity whenever they fill up
+        capacity = INITIAL_BAR_CAPACITY
+        n = 0
+        timestamps = np.empty(capacity, dtype=np.int64)
+        columns = {name: np.empty(capacity) for name in BAR_COLUMNS}
+        opens, highs, lows, closes, volumes = columns.values()
         try:
             for agg in self.client.list_aggs(
                 ticker=symbol,
@@ -51,75 +73,101 @@ class IntradayDataFetcher:
                 to=end_date.strftime('%Y-%m-%d'),
                 limit=50000
             ):
-                bars.append({
-                    'timestamp': datetime.fromtimestamp(agg.timestamp / 1000),
-                    'open': agg.open,
-                    'high': agg.high,
-                    'low': agg.low,
-                    'close': agg.close,
-                    'volume': agg.volume
-                })
-
-                # Add small delay to respect rate limits
-                time.sleep(0.01)
+                if n == capacity:
+                    capacity *= 2
+                    timestamps = np.resize(timestamps, capacity)
+                    columns = {name: np.resize(values, capacity) for name, values in columns.items()}
+                    opens, highs, lows, closes, volumes = columns.values()
+
+                timestamps[n] = agg.timestamp
+                opens[n] = agg.open
+                highs[n] = agg.high
+                lows[n] = agg.low
+                closes[n] = agg.close
+                volumes[n] = agg.volume
+                n += 1
 
         except Exception as e:
             print(f"Warning: API error - {str(e)}")
-            if len(bars) == 0:
+            if n == 0:
                 raise
 
-        # Convert to DataFrame
-        df = pd.DataFrame(bars)
-
-        if len(df) == 0:
+        if n == 0:
             raise ValueError(f"No data retrieved for {symbol}")
 
+        # Polygon timestamps are epoch milliseconds; convert them all at once
+        # to naive local time (what datetime.fromtimestamp gives per bar)
+        index = pd.DatetimeIndex(
+            pd.to_datetime(timestamps[:n], unit='ms', utc=True)
+            .tz_convert(tz.tzlocal())
+            .tz_localize(None),
+            name='timestamp'
+        )
+
+        # Convert to DataFrame
+        df = pd.DataFrame({name: values[:n] for name, values in columns.items()},
+                          index=index, copy=False)
+
         # Sort by timestamp
-        df = df.sort_values('timestamp').reset_index(drop=True)
+        df = df.sort_index()
 
         # Filter to market hours only (9:30 AM - 4:00 PM ET)
         # Note: Polygon data is in UTC, so we need to convert
-        df['hour'] = df['timestamp'].dt.hour
-        df['minute'] = df['timestamp'].dt.minute
-
         # Keep only regular market hours (assuming data is in ET)
-        # Regular hours: 9:30 AM (9.5) to 4:00 PM (16.0)
-        df['time_decimal'] = df['hour'] + df['minute'] / 60
-        df = df[(df['time_decimal'] >= 9.5) & (df['time_decimal'] <= 16.0)].copy()
-
-        # Drop helper columns
-        df = df.drop(['hour', 'minute', 'time_decimal'], axis=1)
-
-        # Set timestamp as index
-        df = df.set_index('timestamp')
+        # Regular hours: 9:30 AM (570 min) to 4:00 PM (960 min)
+        minutes = df.index.hour * 60 + df.index.minute
+        df = df[(minutes >= 570) & (minutes <= 960)]
 
         print(f"Retrieved {len(df)} 30-minute bars for {symbol}")
         print(f"Date range: {df.index[0]} to {df.index[-1]}")
 
         return df
 
-    def fetch_multiple_symbols(self, symbols, days_back=90):
+    def _wait_for_request_slot(self):
+        """Block until SYMBOL_REQUEST_INTERVAL has passed since the last start"""
+        with self._throttle_lock:
+            now = time.monotonic()
+            start = max(now, self._next_request_time)
+            self._next_request_time = start + SYMBOL_REQUEST_INTERVAL
+        if start > now:
+            time.sleep(start - now)
+
+    def _fetch_throttled(self, symbol, days_back):
+        """fetch_30min_bars, started no sooner than the request quota allows"""
+        self._wait_for_request_slot()
+        return self.fetch_30min_bars(symbol, days_back)
+
+    def fetch_multiple_symbols(self, symbols, days_back=90, max_workers=4):
         """
         Fetch 30-minute bars for multiple symbols
 
+        Downloads run concurrently on a small thread pool (they are network
+        bound); request starts are still spaced SYMBOL_REQUEST_INTERVAL apart.
+
         Args:
             symbols: List of stock symbols
             days_back: Number of days of historical data
+            max_workers: Maximum number of concurrent downloads
 
         Returns:
             Dictionary of {symbol: DataFrame}
         """
+        if len(symbols) == 0:
+            return {}
+
         data = {}
-        for symbol in symbols:
-            try:
-                data[symbol] = self.fetch_30min_bars(symbol, days_back)
-                # Add delay between symbols to avoid rate limits
-                time.sleep(1)
-            except Exception as e:
-                print(f"Error fetching {symbol}: {str(e)}")
-                continue
-
-        return data
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(symbols))) as executor:
+            futures = {executor.submit(self._fetch_throttled, symbol, days_back): symbol
+                       for symbol in symbols}
+            for future in as_completed(futures):
+                symbol = futures[future]
+                try:
+                    data[symbol] = future.result()
+                except Exception as e:
+                    print(f"Error fetching {symbol}: {str(e)}")
+
+        # Keep the caller's symbol order
+        return {symbol: data[symbol] for symbol in symbols if symbol in data}
 
 
 if __name__ == "__main__":
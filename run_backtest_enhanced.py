@@ -11,6 +11,9 @@ from data_fetcher import EconomicDataFetcher
 from cycle_classifier import EconomicCycleClassifier
 from backtester import Backtester
 from backtester_enhanced import BacktesterEnhanced
+from chart_utils import downsample, drawdown, lttb
+import matplotlib
+matplotlib.use('Agg')  # Charts are only saved to PNG - no interactive backend needed
 import matplotlib.pyplot as plt
 import pandas as pd
 
@@ -112,6 +115,20 @@ def main():
 
     print()
 
+    # ========== STOP-LOSS SENSITIVITY ==========
+    # Each combination is an independent run, so they are spread over worker
+    # processes (the price/cycle data is shipped to each worker once)
+    print("ENHANCED STRATEGY - STOP-LOSS SENSITIVITY")
+    print("-" * 70)
+    sensitivity = backtester_enhanced.sweep({
+        'peak_stop_loss': [0.10, 0.15, 0.20],
+        'expansion_stop_loss': [0.15, 0.20, 0.25]
+    })
+    print(sensitivity[['total_return', 'sharpe_ratio', 'max_drawdown', 'total_trades']]
+          .to_string(float_format=lambda x: f"{x:.2f}"))
+
+    print()
+
     # Show recent trades from enhanced strategy
     print("ENHANCED STRATEGY - RECENT TRADES (Last 10)")
     print("-" * 70)
@@ -143,14 +160,21 @@ def plot_comparison(results_orig, results_enh, bt_orig, bt_enh):
 
     fig, axes = plt.subplots(4, 1, figsize=(16, 12), sharex=True)
 
+    # Thin every daily line to about the figure's pixel width before drawing -
+    # LTTB for the smooth lines, min/max for drawdowns and 0/1 positions. The
+    # sparse stop-loss hit markers below are plotted unthinned.
+    orig_value = lttb(results_orig['strategy_value'])
+    enh_value = lttb(results_enh['strategy_value'])
+    bh_value = lttb(results_orig['buyhold_value'])
+
     # Plot 1: Equity curves comparison
     ax = axes[0]
-    ax.plot(results_orig.index, results_orig['strategy_value'],
-            label='Original (Expansion only)', linewidth=2, color='blue', alpha=0.7)
-    ax.plot(results_enh.index, results_enh['strategy_value'],
-            label='Enhanced (Peak+Recovery+SL)', linewidth=2, color='green', alpha=0.9)
-    ax.plot(results_orig.index, results_orig['buyhold_value'],
-            label='Buy & Hold', linewidth=2, color='gray', alpha=0.5, linestyle='--')
+    ax.plot(orig_value.index, orig_value,
+            label='Original (Expansion only)', linewidth=2, color='blue', alpha=0.7, rasterized=True)
+    ax.plot(enh_value.index, enh_value,
+            label='Enhanced (Peak+Recovery+SL)', linewidth=2, color='green', alpha=0.9, rasterized=True)
+    ax.plot(bh_value.index, bh_value,
+            label='Buy & Hold', linewidth=2, color='gray', alpha=0.5, linestyle='--', rasterized=True)
     ax.set_ylabel('Portfolio Value ($)')
     ax.set_title('Strategy Comparison: Original vs Enhanced vs Buy & Hold')
     ax.legend(loc='upper left')
@@ -160,21 +184,16 @@ def plot_comparison(results_orig, results_enh, bt_orig, bt_enh):
     # Plot 2: Drawdown comparison
     ax = axes[1]
 
-    orig_peak = results_orig['strategy_value'].expanding().max()
-    orig_dd = (results_orig['strategy_value'] - orig_peak) / orig_peak * 100
-
-    enh_peak = results_enh['strategy_value'].expanding().max()
-    enh_dd = (results_enh['strategy_value'] - enh_peak) / enh_peak * 100
-
-    bh_peak = results_orig['buyhold_value'].expanding().max()
-    bh_dd = (results_orig['buyhold_value'] - bh_peak) / bh_peak * 100
+    orig_dd = downsample(pd.Series(drawdown(results_orig['strategy_value']), index=results_orig.index))
+    enh_dd = downsample(pd.Series(drawdown(results_enh['strategy_value']), index=results_enh.index))
+    bh_dd = downsample(pd.Series(drawdown(results_orig['buyhold_value']), index=results_orig.index))
 
-    ax.fill_between(results_orig.index, 0, orig_dd,
-                    label='Original', alpha=0.4, color='blue')
-    ax.fill_between(results_enh.index, 0, enh_dd,
-                    label='Enhanced', alpha=0.6, color='green')
-    ax.plot(results_orig.index, bh_dd,
-            label='Buy & Hold', linewidth=1.5, color='gray', alpha=0.7, linestyle='--')
+    ax.fill_between(orig_dd.index, 0, orig_dd,
+                    label='Original', alpha=0.4, color='blue', rasterized=True)
+    ax.fill_between(enh_dd.index, 0, enh_dd,
+                    label='Enhanced', alpha=0.6, color='green', rasterized=True)
+    ax.plot(bh_dd.index, bh_dd,
+            label='Buy & Hold', linewidth=1.5, color='gray', alpha=0.7, linestyle='--', rasterized=True)
     ax.set_ylabel('Drawdown (%)')
     ax.set_title('Drawdown Comparison')
     ax.legend()
@@ -182,9 +201,11 @@ def plot_comparison(results_orig, results_enh, bt_orig, bt_enh):
 
     # Plot 3: Position comparison
     ax = axes[2]
-    ax.fill_between(results_orig.index, 0, results_orig['position'],
+    orig_position = downsample(results_orig['position'])
+    enh_position = downsample(results_enh['position'])
+    ax.fill_between(orig_position.index, 0, orig_position,
                     label='Original Position', alpha=0.4, color='blue', step='post')
-    ax.fill_between(results_enh.index, 0, results_enh['position'],
+    ax.fill_between(enh_position.index, 0, enh_position,
                     label='Enhanced Position', alpha=0.6, color='green', step='post')
     ax.set_ylabel('Position')
     ax.set_title('Position Comparison (1 = Long, 0 = Cash)')
@@ -194,14 +215,15 @@ def plot_comparison(results_orig, results_enh, bt_orig, bt_enh):
 
     # Plot 4: Stop-loss levels (Enhanced only)
     ax = axes[3]
-    ax.plot(results_enh.index, results_enh['price'],
+    price = lttb(results_enh['price'])
+    ax.plot(price.index, price,
             label='SPY Price', linewidth=1.5, color='black', alpha=0.7)
 
     # Plot stop-loss levels when in position
     in_position = results_enh['position'] == 1
     if 'stop_loss_level' in results_enh.columns:
-        ax.plot(results_enh.index[in_position],
-               results_enh.loc[in_position, 'stop_loss_level'],
+        stop_loss_level = lttb(results_enh.loc[in_position, 'stop_loss_level'])
+        ax.plot(stop_loss_level.index, stop_loss_level,
                label='Stop-Loss Level', linewidth=1, color='red', alpha=0.5, linestyle=':')
 
     # Mark stop-loss hits
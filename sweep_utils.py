@@ -0,0 +1,69 @@
+"""
+Parallel parameter sweeps shared by the backtesters
+
+Each backtester supplies an initializer that builds its per-process state
+(normally a backtester over the shared data) and a worker that runs one
+parameter combination on that state and returns a flat dict of metrics.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+import contextlib
+import functools
+import io
+import itertools
+
+import pandas as pd
+
+
+# Per-process state built by the pool initializer, so the data is pickled
+# once per worker rather than once per parameter combination
+_worker_state = None
+
+
+def _init_worker(initializer, initargs):
+    """Pool initializer: build the worker process's state once"""
+    global _worker_state
+    _worker_state = initializer(*initargs)
+
+
+def _run_worker(worker, params):
+    """Run one parameter combination on this process's state"""
+    # Keep the per-run progress output out of the parent's console
+    with contextlib.redirect_stdout(io.StringIO()):
+        return worker(_worker_state, params)
+
+
+def run_sweep(param_grid, initializer, initargs, worker, max_workers=None):
+    """
+    Run a worker over every combination of parameters in parallel
+
+    Args:
+        param_grid: Dict mapping parameter names to lists of values
+        initializer: Picklable callable building each process's state from
+            initargs (e.g. a backtester class)
+        initargs: Tuple of arguments for initializer
+        worker: Picklable callable (state, params) -> dict of metrics
+        max_workers: Number of worker processes (None = one per CPU)
+
+    Returns:
+        DataFrame of the worker's metrics, one row per parameter
+        combination, indexed by the parameter values
+    """
+    names = list(param_grid)
+    combos = [dict(zip(names, values))
+              for values in itertools.product(*param_grid.values())]
+
+    print(f"Sweeping {len(combos)} parameter combinations...")
+
+    with ProcessPoolExecutor(max_workers=max_workers,
+                             initializer=_init_worker,
+                             initargs=(initializer, initargs)) as executor:
+        rows = list(executor.map(functools.partial(_run_worker, worker), combos))
+
+    # Lists (e.g. stage lists) are unhashable - use tuples in the index
+    index = pd.MultiIndex.from_tuples(
+        [tuple(tuple(v) if isinstance(v, list) else v for v in combo.values())
+         for combo in combos],
+        names=names
+    )
+    return pd.DataFrame(rows, index=index)
@@ -6,33 +6,207 @@ Implements entry/exit logic based on technical indicators
 import pandas as pd
 import numpy as np
 from datetime import datetime
+import hashlib
+import os
+from disk_cache import CACHE_DIR, read_frame, write_frame
+from sweep_utils import run_sweep
 from technical_indicators import TechnicalIndicators
 
 
+# Bars with indicators added are kept on disk, one parquet file per distinct
+# input data + indicator config, so repeated runs skip the indicator passes
+INDICATOR_CACHE_DIR = os.path.join(CACHE_DIR, 'indicators')
+INDICATOR_CACHE_MAX_AGE = 7 * 24 * 60 * 60  # seconds
+
+# Part of every indicator cache key: bump it whenever a change to
+# technical_indicators alters the values add_all_indicators returns, so
+# frames written by older code are never read back
+INDICATOR_CACHE_VERSION = 1
+
+
+# Exit reasons, indexed by the integer codes the bar loop records
+EXIT_REASONS = ('STOP_LOSS', 'PROFIT_TARGET', 'TECHNICAL', 'ECONOMIC')
+
+# Results 'signal' categories: code 0 is a buy, code k + 1 a sell for
+# EXIT_REASONS[k] (-1 = no signal)
+SIGNALS = ('BUY',) + tuple(f'SELL_{reason}' for reason in EXIT_REASONS)
+
+
+def _run_swing_loop(close, ready, entry_signal, exit_signal, can_trade,
+                    stop_loss_pct, profit_target_pct, capital):
+    """
+    Sequential bar-by-bar position state machine behind run_strategy
+
+    Works on NumPy arrays with scalar locals only (no pandas row lookups per
+    bar), since every bar's decision depends on the position carried over
+    from earlier bars. The indicator conditions themselves depend on no
+    state and arrive precomputed as boolean masks.
+
+    Args:
+        close: float64 array of bar closes
+        ready: bool array, False while the indicators are still warming up
+        entry_signal, exit_signal: bool arrays, True where the technical
+            entry / exit condition holds
+        can_trade: bool array, False where the economic filter blocks trading
+        stop_loss_pct, profit_target_pct: see SwingBacktester.run_strategy
+        capital: Starting cash
+
+    Returns:
+        Tuple (position, cash, signal, trades, state): per-bar int64 share
+        counts, float64 cash and int8 SIGNALS codes; trades as a tuple of
+        arrays (entry_idx, exit_idx, shares, reason) with reason indexing
+        EXIT_REASONS; and the final (capital, shares, entry_price).
+    """
+    n = len(close)
+    position = np.zeros(n, dtype=np.int64)
+    cash = np.empty(n, dtype=np.float64)
+    signal = np.full(n, -1, dtype=np.int8)
+
+    # At most one trade closes every second bar
+    max_trades = n // 2 + 1
+    trade_entry_idx = np.empty(max_trades, dtype=np.int64)
+    trade_exit_idx = np.empty(max_trades, dtype=np.int64)
+    trade_shares = np.empty(max_trades, dtype=np.int64)
+    trade_reason = np.empty(max_trades, dtype=np.int8)
+    n_trades = 0
+
+    shares = 0
+    entry_price = None
+    entry_i = -1
+
+    # Stop/target as price levels fixed at entry, so each bar compares the
+    # price directly instead of recomputing its return from the entry price
+    stop_price = target_price = None
+
+    # Leading warm-up bars hold only the starting cash - fill them at once
+    # and start the loop at the first bar with indicators
+    start = int(np.argmax(ready)) if ready.any() else n
+    cash[:start] = capital
+
+    bars = zip(close[start:].tolist(), ready[start:].tolist(), entry_signal[start:].tolist(),
+               exit_signal[start:].tolist(), can_trade[start:].tolist())
+
+    for i, (price, bar_ready, entry_ok, tech_exit, trade_ok) in enumerate(bars, start=start):
+        # Skip if indicators not ready (e.g. RSI is undefined over flat prices)
+        if not bar_ready:
+            cash[i] = capital
+            continue
+
+        # If no position, look for entry signals
+        if shares == 0 and trade_ok:
+            if entry_ok:
+                # Enter long position
+                new_shares = int(capital / price)
+                if new_shares > 0:
+                    shares = new_shares
+                    entry_price = price
+                    entry_i = i
+                    stop_price = entry_price * (1.0 - stop_loss_pct)
+                    target_price = (entry_price * (1.0 + profit_target_pct)
+                                    if profit_target_pct is not None else float('inf'))
+                    capital -= shares * price
+                    signal[i] = 0
+
+        # If we have a position, check exit conditions
+        elif shares > 0:
+            exit_reason = -1
+
+            # Stop loss check
+            if price <= stop_price:
+                exit_reason = 0
+
+            # Profit target check
+            elif price >= target_price:
+                exit_reason = 1
+
+            # Technical exit check
+            elif tech_exit:
+                exit_reason = 2
+
+            # Economic regime exit (contraction)
+            elif not trade_ok:
+                exit_reason = 3
+
+            # Exit if signal
+            if exit_reason >= 0:
+                capital += shares * price
+
+                # Record trade
+                trade_entry_idx[n_trades] = entry_i
+                trade_exit_idx[n_trades] = i
+                trade_shares[n_trades] = shares
+                trade_reason[n_trades] = exit_reason
+                n_trades += 1
+
+                shares = 0
+                entry_price = stop_price = target_price = None
+                signal[i] = exit_reason + 1
+
+        # Holdings at the close; equity is valued from them after the loop
+        position[i] = shares
+        cash[i] = capital
+
+    trades = (trade_entry_idx[:n_trades], trade_exit_idx[:n_trades],
+              trade_shares[:n_trades], trade_reason[:n_trades])
+    return position, cash, signal, trades, (capital, shares, entry_price)
+
+
+def _init_sweep_state(data, initial_capital, fixed_params):
+    """Sweep initializer: keep the indicator frame and fixed arguments in each worker"""
+    return SwingBacktester(data, initial_capital, cache_dir=None), fixed_params
+
+
+def _run_sweep_params(state, params):
+    """Sweep worker: run one parameter combination and return its metrics"""
+    backtester, fixed_params = state
+    backtester.run_strategy(**fixed_params, **params)
+    return dict(backtester.metrics)
+
+
 class SwingBacktester:
     """Backtest swing trading strategies on intraday data"""
 
-    def __init__(self, data, initial_capital=100000):
+    def __init__(self, data, initial_capital=100000, cache_dir=INDICATOR_CACHE_DIR):
         """
         Initialize the swing backtester
 
         Args:
-            data: DataFrame with OHLC data and timestamp index
+            data: DataFrame with OHLC data and timestamp index (not modified;
+                add_indicators builds a new frame rather than adding columns)
             initial_capital: Starting capital
+            cache_dir: Directory for cached indicator frames (None = no disk cache)
         """
-        self.data = data.copy()
+        self.data = data
         self.initial_capital = initial_capital
+        self.cache_dir = cache_dir
         self.capital = initial_capital
         self.position = 0  # Number of shares held
         self.entry_price = None
-        self.trades = []
-        self.equity_curve = []
+        self.trades = pd.DataFrame()  # One row per closed trade
         self.results = None
         self.metrics = {}
 
     def add_indicators(self, config):
-        """Add technical indicators to the data"""
+        """Add technical indicators to the data, reading/writing the disk cache when enabled"""
+        if self.cache_dir is None:
+            self.data = TechnicalIndicators.add_all_indicators(self.data, config)
+            return self
+
+        # Key on the bar values themselves, so different symbols or refreshed
+        # bars over the same dates never share an entry
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f"v{INDICATOR_CACHE_VERSION}".encode())
+        digest.update(pd.util.hash_pandas_object(self.data).to_numpy().tobytes())
+        digest.update(repr(sorted((config or {}).items())).encode())
+        path = os.path.join(self.cache_dir, f"indicators_{digest.hexdigest()}.parquet")
+
+        cached = read_frame(path, max_age=INDICATOR_CACHE_MAX_AGE)
+        if cached is not None:
+            self.data = cached
+            return self
+
         self.data = TechnicalIndicators.add_all_indicators(self.data, config)
+        write_frame(self.data, path, max_age=INDICATOR_CACHE_MAX_AGE, compression='zstd')
         return self
 
     def run_strategy(self,
@@ -59,225 +233,202 @@ class SwingBacktester:
         Returns:
             DataFrame with results
         """
-        results = []
-        self.position = 0
-        self.capital = self.initial_capital
-        self.entry_price = None
-        self.trades = []
-        entry_time = None
-        highest_price_since_entry = None
-
-        for i, (timestamp, row) in enumerate(self.data.iterrows()):
-            # Skip if indicators not ready
-            if pd.isna(row.get('rsi')) or pd.isna(row.get('bb_lower')):
-                results.append({
-                    'timestamp': timestamp,
-                    'close': row['close'],
-                    'position': 0,
-                    'equity': self.capital,
-                    'signal': None
-                })
-                continue
-
-            # Check if we should be trading (economic expansion filter)
-            can_trade = True
-            if economic_expansion is not None:
-                # Match timestamp to daily economic data
-                date = pd.Timestamp(timestamp.date())
-
-                # Try exact match first
-                if date in economic_expansion.index:
-                    can_trade = economic_expansion.loc[date]
-                else:
-                    # Find nearest previous date
-                    try:
-                        # Use asof to get the most recent value
-                        can_trade = economic_expansion.asof(date)
-                        # If asof returns NaN, default to False (don't trade)
-                        if pd.isna(can_trade):
-                            can_trade = False
-                    except:
-                        # If any error, default to True (trade)
-                        can_trade = True
-
-            current_price = row['close']
-            signal = None
-
-            # If no position, look for entry signals
-            if self.position == 0 and can_trade:
-                entry_signal = self._check_entry(row, entry_condition, rsi_threshold)
-
-                if entry_signal:
-                    # Enter long position
-                    shares = int(self.capital / current_price)
-                    if shares > 0:
-                        self.position = shares
-                        self.entry_price = current_price
-                        entry_time = timestamp
-                        highest_price_since_entry = current_price
-                        cost = shares * current_price
-                        self.capital -= cost
-                        signal = 'BUY'
-
-            # If we have a position, check exit conditions
-            elif self.position > 0:
-                # Update highest price since entry
-                if current_price > highest_price_since_entry:
-                    highest_price_since_entry = current_price
-
-                exit_signal = False
-                exit_reason = None
-
-                # Stop loss check
-                if self.entry_price is not None:
-                    loss_pct = (current_price - self.entry_price) / self.entry_price
-                    if loss_pct <= -stop_loss_pct:
-                        exit_signal = True
-                        exit_reason = 'STOP_LOSS'
-
-                # Profit target check
-                if not exit_signal and profit_target_pct is not None:
-                    gain_pct = (current_price - self.entry_price) / self.entry_price
-                    if gain_pct >= profit_target_pct:
-                        exit_signal = True
-                        exit_reason = 'PROFIT_TARGET'
-
-                # Technical exit check
-                if not exit_signal:
-                    tech_exit = self._check_exit(row, exit_condition, rsi_exit_threshold)
-                    if tech_exit:
-                        exit_signal = True
-                        exit_reason = 'TECHNICAL'
-
-                # Economic regime exit (contraction)
-                if not exit_signal and not can_trade:
-                    exit_signal = True
-                    exit_reason = 'ECONOMIC'
-
-                # Exit if signal
-                if exit_signal:
-                    proceeds = self.position * current_price
-                    self.capital += proceeds
-                    returns = (current_price - self.entry_price) / self.entry_price
-
-                    # Record trade
-                    self.trades.append({
-                        'entry_time': entry_time,
-                        'exit_time': timestamp,
-                        'entry_price': self.entry_price,
-                        'exit_price': current_price,
-                        'shares': self.position,
-                        'return_pct': returns * 100,
-                        'profit': (current_price - self.entry_price) * self.position,
-                        'exit_reason': exit_reason
-                    })
-
-                    self.position = 0
-                    self.entry_price = None
-                    highest_price_since_entry = None
-                    signal = f'SELL_{exit_reason}'
-
-            # Calculate current equity
-            if self.position > 0:
-                equity = self.capital + (self.position * current_price)
-            else:
-                equity = self.capital
-
-            results.append({
-                'timestamp': timestamp,
-                'close': current_price,
-                'position': self.position,
-                'equity': equity,
-                'signal': signal,
-                'rsi': row.get('rsi'),
-                'bb_upper': row.get('bb_upper'),
-                'bb_lower': row.get('bb_lower'),
-                'bb_middle': row.get('bb_middle')
-            })
-
-        self.results = pd.DataFrame(results).set_index('timestamp')
+        data = self.data
+        close = self._column('close')
+        rsi = self._column('rsi')
+        bb_lower = self._column('bb_lower')
+        bb_upper = self._column('bb_upper')
+        bb_middle = self._column('bb_middle')
+
+        # Indicator-only conditions carry no path state, so evaluate them for
+        # every bar up front (comparisons against NaN are False)
+        ready = ~(np.isnan(rsi) | np.isnan(bb_lower))
+        entry_signal = self._entry_signals(entry_condition, rsi_threshold)
+        exit_signal = self._exit_signals(exit_condition, rsi_exit_threshold)
+
+        # Check if we should be trading (economic expansion filter)
+        can_trade = self._economic_filter(economic_expansion)
+
+        position, cash, signal, trades, state = _run_swing_loop(
+            close, ready, entry_signal, exit_signal, can_trade,
+            stop_loss_pct, profit_target_pct, self.initial_capital
+        )
+
+        # Equity is cash plus the value of the shares held, in one pass
+        equity = cash
+        np.add(cash, position * close, out=equity, where=position > 0)
+        self.capital, self.position, self.entry_price = state
+
+        # Record trades, one column per field, built once from the loop's
+        # trade arrays
+        entry_idx, exit_idx, shares, reasons = trades
+        entry_prices = close[entry_idx]
+        exit_prices = close[exit_idx]
+        self.trades = pd.DataFrame({
+            'entry_time': data.index[entry_idx],
+            'exit_time': data.index[exit_idx],
+            'entry_price': entry_prices,
+            'exit_price': exit_prices,
+            'shares': shares,
+            'return_pct': (exit_prices - entry_prices) / entry_prices * 100,
+            'profit': (exit_prices - entry_prices) * shares,
+            # Only four possible exit reasons - categorical makes grouping cheap
+            'exit_reason': pd.Categorical.from_codes(reasons, categories=EXIT_REASONS)
+        })
+
+        # Assemble the results once from the per-bar arrays. Bars skipped
+        # while the indicators warm up carry no indicator values.
+        self.results = pd.DataFrame({
+            'close': close,
+            'position': position,
+            'equity': equity,
+            # Only a handful of distinct signals - store them as a categorical
+            'signal': pd.Categorical.from_codes(signal, categories=SIGNALS),
+            'rsi': np.where(ready, rsi, np.nan),
+            'bb_upper': np.where(ready, bb_upper, np.nan),
+            'bb_lower': np.where(ready, bb_lower, np.nan),
+            'bb_middle': np.where(ready, bb_middle, np.nan)
+        }, index=data.index.rename('timestamp'))
         self._calculate_metrics()
 
         return self.results
 
-    def _check_entry(self, row, condition, rsi_threshold):
-        """Check if entry conditions are met"""
+    def sweep(self, param_grid, max_workers=None, **fixed_params):
+        """
+        Run run_strategy over every combination of parameters in parallel
+
+        Call add_indicators first; the indicator columns are shared by every
+        combination.
+
+        Args:
+            param_grid: Dict mapping run_strategy argument names to lists of
+                values, e.g. {'rsi_threshold': [25, 30, 35],
+                'stop_loss_pct': [0.01, 0.02], 'profit_target_pct': [None, 0.03]}
+            max_workers: Number of worker processes (None = one per CPU)
+            **fixed_params: run_strategy arguments shared by every combination
+                (e.g. economic_expansion)
+
+        Returns:
+            DataFrame of performance metrics, one row per parameter
+            combination, indexed by the parameter values
+        """
+        return run_sweep(param_grid, _init_sweep_state,
+                         (self.data, self.initial_capital, fixed_params),
+                         _run_sweep_params, max_workers)
+
+    def _column(self, name, dtype=np.float64, default=np.nan):
+        """Data column as an array; indicators that were not added are all default"""
+        if name in self.data.columns:
+            return self.data[name].to_numpy(dtype=dtype)
+        return np.full(len(self.data), default, dtype=dtype)
+
+    def _entry_signals(self, condition, rsi_threshold):
+        """Boolean mask of bars where the entry condition is met"""
+        close = self._column('close')
+        rsi = self._column('rsi')
+
         if condition == 'bb_rsi':
             # Entry: Price below lower BB AND RSI oversold
-            return (row['close'] < row['bb_lower']) and (row['rsi'] < rsi_threshold)
+            return (close < self._column('bb_lower')) & (rsi < rsi_threshold)
 
         elif condition == 'kc_rsi':
             # Entry: Price below lower Keltner AND RSI oversold
-            return (row['close'] < row['kc_lower']) and (row['rsi'] < rsi_threshold)
+            return (close < self._column('kc_lower')) & (rsi < rsi_threshold)
 
         elif condition == 'squeeze':
             # Entry: Squeeze is on AND RSI oversold AND price below BB lower
-            return (row.get('squeeze_on', False)) and \
-                   (row['rsi'] < rsi_threshold) and \
-                   (row['close'] < row['bb_lower'])
+            return self._column('squeeze_on', dtype=bool, default=False) & \
+                   (rsi < rsi_threshold) & \
+                   (close < self._column('bb_lower'))
+
+        return np.zeros(len(self.data), dtype=bool)
 
-        return False
+    def _exit_signals(self, condition, rsi_threshold):
+        """Boolean mask of bars where the technical exit condition is met"""
+        close = self._column('close')
 
-    def _check_exit(self, row, condition, rsi_threshold):
-        """Check if exit conditions are met"""
         if condition == 'bb_upper':
             # Exit: Price crosses above upper BB
-            return row['close'] > row['bb_upper']
+            return close > self._column('bb_upper')
 
         elif condition == 'bb_middle':
             # Exit: Price crosses above middle BB
-            return row['close'] > row['bb_middle']
+            return close > self._column('bb_middle')
 
         elif condition == 'rsi':
             # Exit: RSI overbought
-            return row['rsi'] > rsi_threshold
+            return self._column('rsi') > rsi_threshold
 
         elif condition == 'kc_upper':
             # Exit: Price crosses above upper Keltner
-            return row['close'] > row['kc_upper']
+            return close > self._column('kc_upper')
+
+        return np.zeros(len(self.data), dtype=bool)
+
+    def _economic_filter(self, economic_expansion):
+        """
+        Per-bar trading permission from a daily economic expansion Series
+
+        Args:
+            economic_expansion: Series indicating economic expansion (or None)
+
+        Returns:
+            bool array, True where the strategy may open positions
+        """
+        if economic_expansion is None:
+            return np.ones(len(self.data), dtype=bool)
+
+        # Vectorized as-of join: each bar takes the latest daily value on or
+        # before its date; bars before the series starts default to False
+        if not economic_expansion.index.is_monotonic_increasing:
+            economic_expansion = economic_expansion.sort_index()
+        aligned = economic_expansion.reindex(self.data.index.normalize(), method='ffill')
+        can_trade = aligned.to_numpy(dtype=bool, na_value=False)
 
-        return False
+        return can_trade
 
     def _calculate_metrics(self):
         """Calculate performance metrics"""
         if self.results is None or len(self.results) == 0:
             return
 
-        # Convert trades to DataFrame
-        trades_df = pd.DataFrame(self.trades) if len(self.trades) > 0 else pd.DataFrame()
+        equity = self.results['equity'].to_numpy(dtype=np.float64)
+        final_value = equity[-1]
 
         # Calculate equity curve metrics
-        total_return = (self.results['equity'].iloc[-1] - self.initial_capital) / self.initial_capital * 100
+        total_return = (final_value - self.initial_capital) / self.initial_capital * 100
 
         # Annualized return
         days = (self.results.index[-1] - self.results.index[0]).days
         years = days / 365.25
-        annual_return = (((self.results['equity'].iloc[-1] / self.initial_capital) ** (1/years)) - 1) * 100 if years > 0 else 0
+        annual_return = (((final_value / self.initial_capital) ** (1/years)) - 1) * 100 if years > 0 else 0
 
         # Volatility (annualized)
-        returns = self.results['equity'].pct_change().dropna()
+        returns = np.diff(equity) / equity[:-1]
         # Assuming 252 trading days * 13 bars per day = 3276 bars per year
         bars_per_year = 3276
-        volatility = returns.std() * np.sqrt(bars_per_year) * 100
+        volatility = returns.std(ddof=1) * np.sqrt(bars_per_year) * 100 if len(returns) > 1 else np.nan
 
         # Sharpe ratio (assuming 2% risk-free rate)
         risk_free_rate = 0.02
         sharpe = (annual_return - risk_free_rate * 100) / volatility if volatility > 0 else 0
 
         # Max drawdown
-        rolling_max = self.results['equity'].expanding().max()
-        drawdown = (self.results['equity'] - rolling_max) / rolling_max * 100
-        max_drawdown = drawdown.min()
+        rolling_max = np.maximum.accumulate(equity)
+        max_drawdown = ((equity - rolling_max) / rolling_max * 100).min()
 
         # Trade statistics
-        if len(trades_df) > 0:
-            win_trades = trades_df[trades_df['return_pct'] > 0]
-            win_rate = len(win_trades) / len(trades_df) * 100
-            avg_win = win_trades['return_pct'].mean() if len(win_trades) > 0 else 0
-            avg_loss = trades_df[trades_df['return_pct'] <= 0]['return_pct'].mean() if len(trades_df[trades_df['return_pct'] <= 0]) > 0 else 0
-            avg_return = trades_df['return_pct'].mean()
-            best_trade = trades_df['return_pct'].max()
-            worst_trade = trades_df['return_pct'].min()
+        trade_returns = (self.trades['return_pct'].to_numpy(dtype=np.float64)
+                         if len(self.trades) > 0 else np.empty(0))
+        if len(trade_returns) > 0:
+            wins = trade_returns[trade_returns > 0]
+            losses = trade_returns[trade_returns <= 0]
+            win_rate = len(wins) / len(trade_returns) * 100
+            avg_win = wins.mean() if len(wins) > 0 else 0
+            avg_loss = losses.mean() if len(losses) > 0 else 0
+            avg_return = trade_returns.mean()
+            best_trade = trade_returns.max()
+            worst_trade = trade_returns.min()
         else:
             win_rate = 0
             avg_win = 0
@@ -292,8 +443,8 @@ class SwingBacktester:
             'volatility': volatility,
             'sharpe_ratio': sharpe,
             'max_drawdown': max_drawdown,
-            'final_value': self.results['equity'].iloc[-1],
-            'total_trades': len(trades_df),
+            'final_value': final_value,
+            'total_trades': len(trade_returns),
             'win_rate': win_rate,
             'avg_win': avg_win,
             'avg_loss': avg_loss,
@@ -303,12 +454,11 @@ class SwingBacktester:
         }
 
     def get_trades_df(self):
-        """Return trades as a formatted DataFrame"""
+        """Return trades as a formatted DataFrame (shared - treat as read-only)"""
         if len(self.trades) == 0:
             return pd.DataFrame()
 
-        df = pd.DataFrame(self.trades)
-        return df
+        return self.trades
 
 
 if __name__ == "__main__":
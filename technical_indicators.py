@@ -7,11 +7,65 @@ import pandas as pd
 import numpy as np
 
 
+# Default squeeze_indicator bands (TTM Squeeze: BB(20, 2.0) inside KC(20, 1.5))
+SQUEEZE_BB_PERIOD = 20
+SQUEEZE_BB_STD = 2.0
+SQUEEZE_KC_PERIOD = 20
+SQUEEZE_KC_MULT = 1.5
+
+
+def _ema(values, span):
+    """Exponential moving average (adjust=False) of a Series or array, as an array"""
+    return pd.Series(values, copy=False).ewm(span=span, adjust=False).mean().to_numpy()
+
+
+def _diff(values):
+    """First difference of an array (like Series.diff), NaN for the first element"""
+    delta = np.empty_like(values)
+    delta[:1] = np.nan
+    np.subtract(values[1:], values[:-1], out=delta[1:])
+    return delta
+
+
 class TechnicalIndicators:
     """Calculate technical indicators for trading signals"""
 
     @staticmethod
-    def bollinger_bands(df, period=20, std_dev=2.0):
+    def _add_columns(df, columns, inplace):
+        """Add a dict of indicator arrays to df (or to a copy of it)"""
+        # The indicators only add columns, so a shallow copy is enough to keep
+        # them out of the caller's frame; the input columns are never written
+        result = df if inplace else df.copy(deep=False)
+        for name, values in columns.items():
+            result[name] = values
+        return result
+
+    @staticmethod
+    def _bollinger_columns(close, period, std_dev):
+        """Bollinger Band arrays for a close Series"""
+        # Middle band (SMA) and standard deviation, from one rolling window
+        rolling = close.rolling(window=period)
+        middle = rolling.mean().to_numpy()
+        band = rolling.std().to_numpy() * std_dev
+
+        # Upper and lower bands
+        upper = middle + band
+        lower = middle - band
+        width = upper - lower
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return {
+                'bb_middle': middle,
+                'bb_upper': upper,
+                'bb_lower': lower,
+                # Bandwidth (for reference)
+                'bb_bandwidth': width / middle,
+                # %B indicator (where price is within bands)
+                'bb_percent': (close.to_numpy() - lower) / width
+            }
+
+    @staticmethod
+    def bollinger_bands(df, period=20, std_dev=2.0, inplace=False):
         """
         Calculate Bollinger Bands
 
@@ -19,32 +73,35 @@ class TechnicalIndicators:
             df: DataFrame with 'close' column
             period: Moving average period
             std_dev: Number of standard deviations
+            inplace: Add the columns to df itself instead of a copy
 
         Returns:
             DataFrame with bb_middle, bb_upper, bb_lower columns
         """
-        result = df.copy()
-
-        # Middle band (SMA)
-        result['bb_middle'] = result['close'].rolling(window=period).mean()
+        columns = TechnicalIndicators._bollinger_columns(df['close'], period, std_dev)
+        return TechnicalIndicators._add_columns(df, columns, inplace)
 
-        # Standard deviation
-        rolling_std = result['close'].rolling(window=period).std()
-
-        # Upper and lower bands
-        result['bb_upper'] = result['bb_middle'] + (rolling_std * std_dev)
-        result['bb_lower'] = result['bb_middle'] - (rolling_std * std_dev)
-
-        # Bandwidth (for reference)
-        result['bb_bandwidth'] = (result['bb_upper'] - result['bb_lower']) / result['bb_middle']
+    @staticmethod
+    def _keltner_columns(df, period, atr_mult, tr=None):
+        """Keltner Channel arrays (and the ATR they use) for an OHLC frame"""
+        # Middle line (EMA of close)
+        middle = _ema(df['close'], period)
 
-        # %B indicator (where price is within bands)
-        result['bb_percent'] = (result['close'] - result['bb_lower']) / (result['bb_upper'] - result['bb_lower'])
+        # Calculate ATR
+        if tr is None:
+            tr = TechnicalIndicators._true_range(df)
+        atr = _ema(tr, period)
 
-        return result
+        # Upper and lower channels
+        return {
+            'kc_middle': middle,
+            'atr': atr,
+            'kc_upper': middle + (atr * atr_mult),
+            'kc_lower': middle - (atr * atr_mult)
+        }
 
     @staticmethod
-    def keltner_channel(df, period=20, atr_mult=2.0):
+    def keltner_channel(df, period=20, atr_mult=2.0, inplace=False):
         """
         Calculate Keltner Channel
 
@@ -52,69 +109,68 @@ class TechnicalIndicators:
             df: DataFrame with 'high', 'low', 'close' columns
             period: EMA period
             atr_mult: ATR multiplier for channel width
+            inplace: Add the columns to df itself instead of a copy
 
         Returns:
             DataFrame with kc_middle, kc_upper, kc_lower columns
         """
-        result = df.copy()
+        columns = TechnicalIndicators._keltner_columns(df, period, atr_mult)
+        return TechnicalIndicators._add_columns(df, columns, inplace)
 
-        # Middle line (EMA of close)
-        result['kc_middle'] = result['close'].ewm(span=period, adjust=False).mean()
+    @staticmethod
+    def _true_range(df):
+        """Calculate True Range for ATR"""
+        high = df['high'].to_numpy(dtype=np.float64)
+        low = df['low'].to_numpy(dtype=np.float64)
+        close = df['close'].to_numpy(dtype=np.float64)
 
-        # Calculate ATR
-        result['tr'] = TechnicalIndicators._true_range(result)
-        result['atr'] = result['tr'].ewm(span=period, adjust=False).mean()
+        prev_close = np.empty_like(close)
+        prev_close[:1] = np.nan
+        prev_close[1:] = close[:-1]
 
-        # Upper and lower channels
-        result['kc_upper'] = result['kc_middle'] + (result['atr'] * atr_mult)
-        result['kc_lower'] = result['kc_middle'] - (result['atr'] * atr_mult)
+        # fmax skips NaN like DataFrame.max(axis=1), so the first bar (no
+        # previous close) is just high - low
+        true_range = np.fmax(high - low,
+                             np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+        return pd.Series(true_range, index=df.index)
 
-        # Clean up temporary columns
-        result = result.drop(['tr'], axis=1)
+    @staticmethod
+    def _rsi_column(close, period):
+        """RSI array for a close Series"""
+        # Calculate price changes
+        delta = _diff(close.to_numpy(dtype=np.float64))
 
-        return result
+        # Separate gains and losses (fmax also turns the leading NaN into 0)
+        gain = np.fmax(delta, 0.0)
+        loss = np.fmax(-delta, 0.0)
 
-    @staticmethod
-    def _true_range(df):
-        """Calculate True Range for ATR"""
-        high_low = df['high'] - df['low']
-        high_close = np.abs(df['high'] - df['close'].shift())
-        low_close = np.abs(df['low'] - df['close'].shift())
-        return pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
+        # Calculate average gains and losses
+        avg_gain = pd.Series(gain, copy=False).rolling(window=period).mean().to_numpy()
+        avg_loss = pd.Series(loss, copy=False).rolling(window=period).mean().to_numpy()
+
+        # RSI = 100 - 100 / (1 + RS) with RS = avg_gain / avg_loss, folded into
+        # one division (still 100 with no losses, NaN with no movement at all)
+        with np.errstate(invalid='ignore'):
+            return 100 * avg_gain / (avg_gain + avg_loss)
 
     @staticmethod
-    def rsi(df, period=14):
+    def rsi(df, period=14, inplace=False):
         """
         Calculate Relative Strength Index (RSI)
 
         Args:
             df: DataFrame with 'close' column
             period: RSI period
+            inplace: Add the columns to df itself instead of a copy
 
         Returns:
             DataFrame with 'rsi' column
         """
-        result = df.copy()
-
-        # Calculate price changes
-        delta = result['close'].diff()
-
-        # Separate gains and losses
-        gain = delta.where(delta > 0, 0)
-        loss = -delta.where(delta < 0, 0)
-
-        # Calculate average gains and losses
-        avg_gain = gain.rolling(window=period).mean()
-        avg_loss = loss.rolling(window=period).mean()
-
-        # Calculate RS and RSI
-        rs = avg_gain / avg_loss
-        result['rsi'] = 100 - (100 / (1 + rs))
-
-        return result
+        columns = {'rsi': TechnicalIndicators._rsi_column(df['close'], period)}
+        return TechnicalIndicators._add_columns(df, columns, inplace)
 
     @staticmethod
-    def stochastic_rsi(df, period=14, smooth_k=3, smooth_d=3):
+    def stochastic_rsi(df, period=14, smooth_k=3, smooth_d=3, inplace=False):
         """
         Calculate Stochastic RSI
 
@@ -123,17 +179,22 @@ class TechnicalIndicators:
             period: RSI period
             smooth_k: %K smoothing period
             smooth_d: %D smoothing period
+            inplace: Add the columns to df itself instead of a copy
 
         Returns:
             DataFrame with 'stoch_rsi_k' and 'stoch_rsi_d' columns
         """
-        result = TechnicalIndicators.rsi(df, period)
+        result = TechnicalIndicators.rsi(df, period, inplace=inplace)
 
-        # Calculate Stochastic of RSI
-        rsi_min = result['rsi'].rolling(window=period).min()
-        rsi_max = result['rsi'].rolling(window=period).max()
+        # Calculate Stochastic of RSI (pandas' rolling min/max are already
+        # O(N) monotonic-deque scans)
+        rsi = result['rsi']
+        rolling = rsi.rolling(window=period)
+        rsi_min = rolling.min().to_numpy()
+        rsi_max = rolling.max().to_numpy()
 
-        result['stoch_rsi'] = (result['rsi'] - rsi_min) / (rsi_max - rsi_min)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            result['stoch_rsi'] = (rsi.to_numpy() - rsi_min) / (rsi_max - rsi_min)
 
         # Smooth for %K and %D
         result['stoch_rsi_k'] = result['stoch_rsi'].rolling(window=smooth_k).mean()
@@ -142,7 +203,23 @@ class TechnicalIndicators:
         return result
 
     @staticmethod
-    def macd(df, fast=12, slow=26, signal=9):
+    def _macd_columns(close, fast, slow, signal):
+        """MACD line, signal and histogram arrays for a close Series"""
+        # Calculate MACD line
+        macd_line = _ema(close, fast) - _ema(close, slow)
+
+        # Signal line
+        macd_signal = _ema(macd_line, signal)
+
+        return {
+            'macd': macd_line,
+            'macd_signal': macd_signal,
+            # Histogram
+            'macd_hist': macd_line - macd_signal
+        }
+
+    @staticmethod
+    def macd(df, fast=12, slow=26, signal=9, inplace=False):
         """
         Calculate MACD (Moving Average Convergence Divergence)
 
@@ -151,45 +228,44 @@ class TechnicalIndicators:
             fast: Fast EMA period
             slow: Slow EMA period
             signal: Signal line period
+            inplace: Add the columns to df itself instead of a copy
 
         Returns:
             DataFrame with 'macd', 'macd_signal', 'macd_hist' columns
         """
-        result = df.copy()
-
-        # Calculate MACD line
-        ema_fast = result['close'].ewm(span=fast, adjust=False).mean()
-        ema_slow = result['close'].ewm(span=slow, adjust=False).mean()
-        result['macd'] = ema_fast - ema_slow
-
-        # Signal line
-        result['macd_signal'] = result['macd'].ewm(span=signal, adjust=False).mean()
-
-        # Histogram
-        result['macd_hist'] = result['macd'] - result['macd_signal']
-
-        return result
+        columns = TechnicalIndicators._macd_columns(df['close'], fast, slow, signal)
+        return TechnicalIndicators._add_columns(df, columns, inplace)
 
     @staticmethod
-    def atr(df, period=14):
+    def atr(df, period=14, inplace=False):
         """
         Calculate Average True Range (ATR)
 
         Args:
             df: DataFrame with 'high', 'low', 'close' columns
             period: ATR period
+            inplace: Add the columns to df itself instead of a copy
 
         Returns:
             DataFrame with 'atr' column
         """
-        result = df.copy()
-        result['tr'] = TechnicalIndicators._true_range(result)
-        result['atr'] = result['tr'].ewm(span=period, adjust=False).mean()
-        result = result.drop(['tr'], axis=1)
-        return result
+        columns = {'atr': _ema(TechnicalIndicators._true_range(df), period)}
+        return TechnicalIndicators._add_columns(df, columns, inplace)
 
     @staticmethod
-    def squeeze_indicator(df, bb_period=20, bb_std=2.0, kc_period=20, kc_mult=1.5):
+    def _squeeze_columns(df, bb_period, bb_std, kc_period, kc_mult):
+        """Squeeze flag array, plus the Bollinger/Keltner arrays it is built from"""
+        columns = TechnicalIndicators._bollinger_columns(df['close'], bb_period, bb_std)
+        columns.update(TechnicalIndicators._keltner_columns(df, kc_period, kc_mult))
+
+        # Squeeze is ON when BB is inside KC
+        columns['squeeze_on'] = (columns['bb_lower'] > columns['kc_lower']) & \
+                                (columns['bb_upper'] < columns['kc_upper'])
+        return columns
+
+    @staticmethod
+    def squeeze_indicator(df, bb_period=SQUEEZE_BB_PERIOD, bb_std=SQUEEZE_BB_STD,
+                          kc_period=SQUEEZE_KC_PERIOD, kc_mult=SQUEEZE_KC_MULT, inplace=False):
         """
         Calculate TTM Squeeze indicator (Bollinger Bands inside Keltner Channel)
 
@@ -199,35 +275,28 @@ class TechnicalIndicators:
             bb_std: Bollinger Bands standard deviation
             kc_period: Keltner Channel period
             kc_mult: Keltner Channel ATR multiplier
+            inplace: Add the columns to df itself instead of a copy
 
         Returns:
             DataFrame with 'squeeze_on' column (True when squeeze is active)
         """
-        result = df.copy()
-
-        # Calculate Bollinger Bands
-        result = TechnicalIndicators.bollinger_bands(result, bb_period, bb_std)
-
-        # Calculate Keltner Channel
-        result = TechnicalIndicators.keltner_channel(result, kc_period, kc_mult)
-
-        # Squeeze is ON when BB is inside KC
-        result['squeeze_on'] = (result['bb_lower'] > result['kc_lower']) & \
-                               (result['bb_upper'] < result['kc_upper'])
-
-        return result
+        columns = TechnicalIndicators._squeeze_columns(df, bb_period, bb_std, kc_period, kc_mult)
+        return TechnicalIndicators._add_columns(df, columns, inplace)
 
     @staticmethod
-    def add_all_indicators(df, config=None):
+    def add_all_indicators(df, config=None, return_arrays=False):
         """
         Add all technical indicators to the dataframe
 
         Args:
             df: DataFrame with OHLC data
             config: Dictionary with indicator parameters (optional)
+            return_arrays: Return only the indicators, as a dict of arrays,
+                without copying df
 
         Returns:
-            DataFrame with all indicators
+            DataFrame with all indicators (or {indicator name: array} with
+            return_arrays)
         """
         if config is None:
             config = {
@@ -239,41 +308,55 @@ class TechnicalIndicators:
                 'atr_period': 14
             }
 
-        result = df.copy()
+        close = df['close']
+        columns = {}
+
+        bb_params = (config.get('bb_period', 20), config.get('bb_std', 2.0))
+        kc_params = (config.get('kc_period', 20), config.get('kc_mult', 2.0))
+
+        # True range is shared by every Keltner Channel / ATR below
+        tr = TechnicalIndicators._true_range(df)
 
         # Add Bollinger Bands
-        result = TechnicalIndicators.bollinger_bands(
-            result,
-            period=config.get('bb_period', 20),
-            std_dev=config.get('bb_std', 2.0)
-        )
+        columns.update(TechnicalIndicators._bollinger_columns(close, *bb_params))
 
         # Add Keltner Channel
-        result = TechnicalIndicators.keltner_channel(
-            result,
-            period=config.get('kc_period', 20),
-            atr_mult=config.get('kc_mult', 2.0)
-        )
+        keltner = TechnicalIndicators._keltner_columns(df, *kc_params, tr=tr)
+        columns.update(keltner)
 
         # Add RSI
-        result = TechnicalIndicators.rsi(
-            result,
-            period=config.get('rsi_period', 14)
-        )
-
-        # Add ATR
-        result = TechnicalIndicators.atr(
-            result,
-            period=config.get('atr_period', 14)
-        )
+        columns['rsi'] = TechnicalIndicators._rsi_column(close, period=config.get('rsi_period', 14))
 
         # Add MACD
-        result = TechnicalIndicators.macd(result)
-
-        # Add Squeeze Indicator
-        result = TechnicalIndicators.squeeze_indicator(result)
-
-        return result
+        columns.update(TechnicalIndicators._macd_columns(close, fast=12, slow=26, signal=9))
+
+        # Add Squeeze Indicator. It runs with squeeze_indicator's default
+        # bands and, as it always has, its BB/KC columns (and the KC's ATR)
+        # replace the configured ones - so the ATR from atr_period is never
+        # kept and is not computed. Configured bands that already match the
+        # squeeze settings are reused instead of being computed again.
+        if bb_params != (SQUEEZE_BB_PERIOD, SQUEEZE_BB_STD):
+            columns.update(TechnicalIndicators._bollinger_columns(
+                close, SQUEEZE_BB_PERIOD, SQUEEZE_BB_STD))
+
+        if kc_params != (SQUEEZE_KC_PERIOD, SQUEEZE_KC_MULT):
+            keltner = TechnicalIndicators._keltner_columns(
+                df, SQUEEZE_KC_PERIOD, SQUEEZE_KC_MULT, tr=tr)
+        columns.update(keltner)
+
+        columns['squeeze_on'] = (columns['bb_lower'] > columns['kc_lower']) & \
+                                (columns['bb_upper'] < columns['kc_upper'])
+
+        if return_arrays:
+            return columns
+
+        if df.columns.isin(list(columns)).any():
+            # Recomputing over existing indicator columns: overwrite in place
+            return TechnicalIndicators._add_columns(df, columns, inplace=False)
+
+        # Join all indicators in one step rather than inserting them one
+        # column at a time
+        return pd.concat([df, pd.DataFrame(columns, index=df.index)], axis=1)
 
 
 if __name__ == "__main__":